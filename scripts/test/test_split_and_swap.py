@@ -3,20 +3,73 @@
 Test multicall with split position and swap operations.
 """
 import os
+import functools
+import itertools
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+try:
+    import orjson  # optional, faster parse of the deployment file
+except ImportError:
+    orjson = None
+from eth_abi import encode
 from web3 import Web3
 from src.config.abis import ERC20_ABI
-from src.config.abis.futarchy import FUTARCHY_ROUTER_ABI
-from src.config.abis.swapr import SWAPR_ROUTER_ABI
+from src.helpers.eip7702_builder import APPROVE_SELECTOR, MAX_UINT256, SPLIT_POSITION_SELECTOR, SWAPR_EXACT_IN_SELECTOR
+from src.setup.multicall import balance_of_call, decode_uint, rpc_batch, try_aggregate
 
 # Load environment
-w3 = Web3(Web3.HTTPProvider(os.environ["RPC_URL"]))
+# One pooled keep-alive session carries every RPC of the run, including the parallel receipt polls
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+w3 = Web3(Web3.HTTPProvider(os.environ["RPC_URL"], session=session))
 
-# Load contract ABI
-with open('deployment_info.json', 'r') as f:
-    deployment_info = json.load(f)
-    EXECUTOR_ABI = deployment_info['abi']
+# Gnosis produces a block about every 5s; polling faster than that only repeats empty lookups
+BLOCK_TIME_SECONDS = 5
+
+@functools.lru_cache(maxsize=1)
+def _executor_abi():
+    """Executor ABI from deployment_info.json, read on first use rather than at import."""
+    with open('deployment_info.json', 'rb') as f:
+        raw = f.read()
+    return (orjson.loads(raw) if orjson is not None else json.loads(raw))['abi']
+
+def _wait_receipt(tx_hash):
+    return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120, poll_latency=BLOCK_TIME_SECONDS)
+
+def _balances_of(tokens, owner):
+    """owner's balance of each token from a single Multicall3 eth_call.
+
+    Entries whose balanceOf failed inside the aggregate are re-read with a direct call,
+    which raises rather than reporting a balance the executor may not actually have.
+    """
+    results = try_aggregate(w3, [balance_of_call(t, owner) for t in tokens])
+    balances = []
+    for token, r in zip(tokens, results):
+        bal = decode_uint(r)
+        if bal is None:
+            bal = w3.eth.contract(address=token, abi=ERC20_ABI).functions.balanceOf(owner).call()
+        balances.append(bal)
+    return balances
+
+def _tx_fields(address):
+    """nonce/gasPrice/chainId for the sender, read in one JSON-RPC batch POST."""
+    try:
+        nonce, gas_price, chain_id = (
+            int(x, 16)
+            for x in rpc_batch(
+                w3,
+                [("eth_getTransactionCount", [address, "latest"]), ("eth_gasPrice", []), ("eth_chainId", [])],
+                session=session,
+            )
+        )
+    except Exception:
+        # RPC without batch support: fall back to one request per field
+        nonce, gas_price, chain_id = w3.eth.get_transaction_count(address), w3.eth.gas_price, w3.eth.chain_id
+    return {'nonce': nonce, 'gasPrice': gas_price, 'chainId': chain_id}
 
 def test_split_and_swap():
     """Test split position and swap operations"""
@@ -38,14 +91,16 @@ def test_split_and_swap():
     swapr_router = w3.to_checksum_address(os.environ['SWAPR_ROUTER_ADDRESS'])
     proposal = w3.to_checksum_address(os.environ['FUTARCHY_PROPOSAL_ADDRESS'])
     
+    # Fetched once for the whole run; every tx comes from this account, so the nonce is counted locally
+    tx_fields = _tx_fields(account.address)
+    nonces = itertools.count(tx_fields.pop('nonce'))
+
     print(f"Testing split and swap from account: {account.address}")
     print(f"Executor: {executor_address}")
     
     # Get contracts
-    executor = w3.eth.contract(address=executor_address, abi=EXECUTOR_ABI)
+    executor = w3.eth.contract(address=executor_address, abi=_executor_abi())
     sdai = w3.eth.contract(address=sdai_token, abi=ERC20_ABI)
-    futarchy_router_contract = w3.eth.contract(address=futarchy_router, abi=FUTARCHY_ROUTER_ABI)
-    swapr_router_contract = w3.eth.contract(address=swapr_router, abi=SWAPR_ROUTER_ABI)
     
     # Amount to test with
     amount_wei = int(0.01 * 10**18)  # 0.01 sDAI
@@ -56,30 +111,26 @@ def test_split_and_swap():
     # Approve executor
     tx = sdai.functions.approve(executor_address, amount_wei).build_transaction({
         'from': account.address,
-        'nonce': w3.eth.get_transaction_count(account.address),
         'gas': 100000,
-        'gasPrice': w3.eth.gas_price,
-        'chainId': w3.eth.chain_id
+        'nonce': next(nonces),
+        **tx_fields,
     })
     
+    # Sent without waiting: the pull and the multicall below use the following nonces,
+    # so the chain still executes them in order after this approve
     signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-    w3.eth.wait_for_transaction_receipt(tx_hash)
-    print(f"✅ Approved executor")
+    approve_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
     
     # Pull tokens
     tx = executor.functions.pullToken(sdai_token, amount_wei).build_transaction({
         'from': account.address,
-        'nonce': w3.eth.get_transaction_count(account.address),
         'gas': 150000,
-        'gasPrice': w3.eth.gas_price,
-        'chainId': w3.eth.chain_id
+        'nonce': next(nonces),
+        **tx_fields,
     })
     
     signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-    w3.eth.wait_for_transaction_receipt(tx_hash)
-    print(f"✅ Pulled {Web3.from_wei(amount_wei, 'ether')} sDAI")
+    pull_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
     
     # Step 2: Build multicall for split and swap
     print("\n2. Building multicall for split position and swaps...")
@@ -87,33 +138,20 @@ def test_split_and_swap():
     calls = []
     
     # Call 1: Approve FutarchyRouter
-    approve_data = sdai.encodeABI(
-        fn_name='approve',
-        args=[futarchy_router, amount_wei]
-    )
+    # Calldata is selector + encoded args; no ABI lookup needed for these fixed signatures
+    approve_data = APPROVE_SELECTOR + encode(['address', 'uint256'], [futarchy_router, amount_wei])
     calls.append((sdai_token, approve_data))
     
     # Call 2: Split position
-    split_data = futarchy_router_contract.encodeABI(
-        fn_name='splitPosition',
-        args=[proposal, sdai_token, amount_wei]
-    )
+    split_data = SPLIT_POSITION_SELECTOR + encode(['address', 'address', 'uint256'], [proposal, sdai_token, amount_wei])
     calls.append((futarchy_router, split_data))
     
     # Call 3: Approve Swapr router for YES tokens
-    sdai_yes_contract = w3.eth.contract(address=sdai_yes, abi=ERC20_ABI)
-    approve_yes_data = sdai_yes_contract.encodeABI(
-        fn_name='approve',
-        args=[swapr_router, 2**256 - 1]
-    )
+    approve_yes_data = APPROVE_SELECTOR + encode(['address', 'uint256'], [swapr_router, MAX_UINT256])
     calls.append((sdai_yes, approve_yes_data))
     
     # Call 4: Approve Swapr router for NO tokens
-    sdai_no_contract = w3.eth.contract(address=sdai_no, abi=ERC20_ABI)
-    approve_no_data = sdai_no_contract.encodeABI(
-        fn_name='approve',
-        args=[swapr_router, 2**256 - 1]
-    )
+    approve_no_data = APPROVE_SELECTOR + encode(['address', 'uint256'], [swapr_router, MAX_UINT256])
     calls.append((sdai_no, approve_no_data))
     
     print(f"Total calls: {len(calls)}")
@@ -122,22 +160,26 @@ def test_split_and_swap():
     print("\n3. Executing multicall...")
     tx = executor.functions.multicall(calls).build_transaction({
         'from': account.address,
-        'nonce': w3.eth.get_transaction_count(account.address),
         'gas': 500000,
-        'gasPrice': w3.eth.gas_price,
-        'chainId': w3.eth.chain_id
+        'nonce': next(nonces),
+        **tx_fields,
     })
     
     signed_tx = w3.eth.account.sign_transaction(tx, private_key)
     tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+
+    # All three are in flight; poll their receipts in parallel so the wait is the slowest one, not the sum
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        receipts = list(ex.map(_wait_receipt, (approve_hash, pull_hash, tx_hash)))
+    print(f"✅ Approved executor")
+    print(f"✅ Pulled {Web3.from_wei(amount_wei, 'ether')} sDAI")
+    receipt = receipts[-1]
     
     if receipt.status == 1:
         print(f"✅ Multicall successful! tx: {tx_hash.hex()}")
         
         # Check balances
-        yes_balance = sdai_yes_contract.functions.balanceOf(executor_address).call()
-        no_balance = sdai_no_contract.functions.balanceOf(executor_address).call()
+        yes_balance, no_balance = _balances_of([sdai_yes, sdai_no], executor_address)
         
         print(f"\nConditional token balances:")
         print(f"  YES sDAI: {Web3.from_wei(yes_balance, 'ether')}")
@@ -159,9 +201,8 @@ def test_split_and_swap():
                 0                   # sqrtPriceLimitX96
             )
             
-            swap_data = swapr_router_contract.encodeABI(
-                fn_name='exactInputSingle',
-                args=[swap_params]
+            swap_data = SWAPR_EXACT_IN_SELECTOR + encode(
+                ['(address,address,address,uint256,uint256,uint256,uint160)'], [swap_params]
             )
             
             # Execute single swap
@@ -169,15 +210,14 @@ def test_split_and_swap():
             
             tx = executor.functions.multicall(swap_calls).build_transaction({
                 'from': account.address,
-                'nonce': w3.eth.get_transaction_count(account.address),
                 'gas': 500000,
-                'gasPrice': w3.eth.gas_price,
-                'chainId': w3.eth.chain_id
+                'nonce': next(nonces),
+                **tx_fields,
             })
             
             signed_tx = w3.eth.account.sign_transaction(tx, private_key)
             tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = _wait_receipt(tx_hash)
             
             if receipt.status == 1:
                 print(f"✅ Swap successful! tx: {tx_hash.hex()}")
@@ -197,28 +237,31 @@ def test_split_and_swap():
     # Get all token addresses
     tokens = [sdai_token, sdai_yes, sdai_no, company_yes, company_no]
     
-    for token_addr in tokens:
-        token_contract = w3.eth.contract(address=token_addr, abi=ERC20_ABI)
-        balance = token_contract.functions.balanceOf(executor_address).call()
-        
+    # Each push moves a different token, so they are all sent before waiting on any
+    pushes = []
+    for token_addr, balance in zip(tokens, _balances_of(tokens, executor_address)):
         if balance > 0:
-            tx = executor.functions.pushToken(token_addr, 2**256 - 1).build_transaction({
+            token_contract = w3.eth.contract(address=token_addr, abi=ERC20_ABI)
+            tx = executor.functions.pushToken(token_addr, MAX_UINT256).build_transaction({
                 'from': account.address,
-                'nonce': w3.eth.get_transaction_count(account.address),
                 'gas': 150000,
-                'gasPrice': w3.eth.gas_price,
-                'chainId': w3.eth.chain_id
+                'nonce': next(nonces),
+                **tx_fields,
             })
             
             signed_tx = w3.eth.account.sign_transaction(tx, private_key)
             tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            w3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            try:
-                token_symbol = token_contract.functions.symbol().call()
-            except:
-                token_symbol = "tokens"
-            print(f"  ✅ Pushed {Web3.from_wei(balance, 'ether')} {token_symbol}")
+            pushes.append((token_contract, balance, tx_hash))
+    
+    with ThreadPoolExecutor(max_workers=max(1, len(pushes))) as ex:
+        list(ex.map(_wait_receipt, [h for _, _, h in pushes]))
+    
+    for token_contract, balance, tx_hash in pushes:
+        try:
+            token_symbol = token_contract.functions.symbol().call()
+        except:
+            token_symbol = "tokens"
+        print(f"  ✅ Pushed {Web3.from_wei(balance, 'ether')} {token_symbol}")
 
 if __name__ == "__main__":
     test_split_and_swap()
\ No newline at end of file
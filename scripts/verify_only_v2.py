@@ -4,105 +4,202 @@ Verify already deployed FutarchyArbitrageExecutorV2 contract on Gnosisscan.
 """
 import os
 import json
+import logging
+import random
 import time
-import requests
-from eth_abi import encode
+import asyncio
+import functools
+import re
+import sys
+from urllib.parse import urlencode
 
+try:
+    import orjson  # optional; faster parsing of the (repeated) Gnosisscan replies
+except ImportError:
+    orjson = None
+
+def _loads(body):
+    """Decode a JSON response body (bytes) with orjson when it is installed, else the stdlib."""
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+logger = logging.getLogger(__name__)
+
+FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+_ADDRESS_RE = re.compile(r'^0x[0-9a-fA-F]{40}$')
+
+@functools.lru_cache(maxsize=32)
 def encode_constructor_args(deployer_address):
-    """Encode constructor arguments for verification."""
-    # Constructor takes one address parameter
-    encoded = encode(['address'], [deployer_address])
-    return encoded.hex()
+    """Encode constructor arguments for verification (memoized, so retries reuse the hex)."""
+    # Constructor takes one address parameter: its ABI word is just the 20 bytes left-padded to 32
+    if not _ADDRESS_RE.match(deployer_address):
+        raise ValueError(f"Invalid deployer address: {deployer_address!r}")
+    return deployer_address[2:].lower().zfill(64)
+
+def build_verification_data(api_key, contract_address, source_code, constructor_args):
+    """Gnosisscan verifysourcecode form fields for a FutarchyArbitrageExecutorV2 deployment."""
+    return {
+        'apikey': api_key,
+        'module': 'contract',
+        'action': 'verifysourcecode',
+        'contractaddress': contract_address,
+        'sourceCode': source_code,
+        'codeformat': 'solidity-single-file',
+        'contractname': 'FutarchyArbitrageExecutorV2',
+        'compilerversion': 'v0.8.19+commit.7dd6d404',
+        'optimizationUsed': '1',
+        'runs': '200',
+        'evmversion': 'paris',
+        'constructorArguements': constructor_args
+    }
+
+def check_verify_status(session, api_url, api_key, guid):
+    """One checkverifystatus round-trip for a submission GUID; returns the decoded reply."""
+    check_data = {
+        'apikey': api_key,
+        'module': 'contract',
+        'action': 'checkverifystatus',
+        'guid': guid
+    }
+    check_response = session.get(api_url, params=check_data)
+    return _loads(check_response.content)
+
+def is_final_status(check_result):
+    """True once Gnosisscan reports the submission as verified or failed (anything else is still pending)."""
+    return check_result['status'] == '1' or 'fail' in check_result.get('result', '').lower()
+
+async def verify_one_async(session, api_url, api_key, contract_address, source_code, constructor_args, timeout=60):
+    """Submit one contract and poll until verified, failed or timed out; returns (address, status text)."""
+    body = urlencode(build_verification_data(api_key, contract_address, source_code, constructor_args)).encode()
+    async with session.post(api_url, data=body, headers=FORM_HEADERS) as response:
+        result = _loads(await response.read())
+    if result['status'] != '1':
+        return contract_address, f"submit failed: {result.get('result', 'Unknown error')}"
+    
+    guid = result['result']
+    check_data = {'apikey': api_key, 'module': 'contract', 'action': 'checkverifystatus', 'guid': guid}
+    delay = 1.0
+    deadline = time.monotonic() + timeout
+    while True:
+        async with session.get(api_url, params=check_data) as check_response:
+            check_result = _loads(await check_response.read())
+        if is_final_status(check_result):
+            return contract_address, check_result.get('result', 'Unknown')
+        if time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(delay + random.uniform(0, delay * 0.2))
+        delay = min(delay * 1.6, 10.0)
+    return contract_address, "timed out"
+
+async def verify_many(items, api_key, api_url="https://api.gnosisscan.io/api"):
+    """Verify several (contract_address, source_code, constructor_args) deployments concurrently.
+    
+    All submissions and polls share one aiohttp session, so N contracts take
+    about as long as the slowest one instead of N verifications back to back.
+    """
+    import aiohttp
+    
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=8)) as session:
+        return await asyncio.gather(*(
+            verify_one_async(session, api_url, api_key, address, source, args)
+            for address, source, args in items
+        ))
 
 def main():
     # Load deployment info
     try:
-        with open('deployment_info_v2.json', 'r') as f:
-            deployment_info = json.load(f)
+        with open('deployment_info_v2.json', 'rb') as f:
+            deployment_info = _loads(f.read())
     except FileNotFoundError:
-        print("❌ deployment_info_v2.json not found")
+        logger.error("❌ deployment_info_v2.json not found")
         exit(1)
     
     contract_address = deployment_info['address']
     deployer_address = deployment_info['deployer']
     
-    print(f"🔍 Verifying contract: {contract_address}")
-    print(f"👤 Deployer: {deployer_address}")
+    logger.info("🔍 Verifying contract: %s", contract_address)
+    logger.info("👤 Deployer: %s", deployer_address)
     
     # Read contract source
-    with open('contracts/FutarchyArbitrageExecutorV2.sol', 'r') as f:
-        source_code = f.read()
+    # Binary read + one decode: no newline translation, and the bytes go to Gnosisscan as-is
+    try:
+        with open('contracts/FutarchyArbitrageExecutorV2.sol', 'rb') as f:
+            source_code = f.read().decode('utf-8')
+    except FileNotFoundError:
+        logger.error("❌ contracts/FutarchyArbitrageExecutorV2.sol not found (run from the repo root)")
+        exit(1)
     
     # Check API key
     api_key = os.environ.get('GNOSISSCAN_API_KEY', '')
     if not api_key:
-        print("❌ GNOSISSCAN_API_KEY not set")
-        print("Get API key from: https://gnosisscan.io/myapikey")
+        logger.error("❌ GNOSISSCAN_API_KEY not set")
+        logger.error("Get API key from: https://gnosisscan.io/myapikey")
         exit(1)
     
     # Encode constructor arguments
     constructor_args = encode_constructor_args(deployer_address)
-    print(f"🔧 Constructor args: {constructor_args}")
+    logger.info("🔧 Constructor args: %s", constructor_args)
     
-    # Prepare verification data
-    verification_data = {
-        'apikey': api_key,
-        'module': 'contract',
-        'action': 'verifysourcecode',
-        'contractaddress': contract_address,
-        'sourceCode': source_code,
-        'codeformat': 'solidity-single-file',
-        'contractname': 'FutarchyArbitrageExecutorV2',
-        'compilerversion': 'v0.8.19+commit.7dd6d404',
-        'optimizationUsed': '1',
-        'runs': '200',
-        'evmversion': 'paris',
-        'constructorArguements': constructor_args
-    }
+    # Prepare verification data, form-encoded once up front (the source code dominates the body)
+    verification_data = build_verification_data(api_key, contract_address, source_code, constructor_args)
+    verification_body = urlencode(verification_data).encode()
     
     # Submit verification
-    print("\n📤 Submitting verification...")
+    logger.info("\n📤 Submitting verification...")
     api_url = "https://api.gnosisscan.io/api"
     
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    # One keep-alive connection serves the submit and every status poll; 429/5xx replies are retried
+    # (urllib3 does not retry the POST itself, so a submission is never sent twice)
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
     try:
-        response = requests.post(api_url, data=verification_data)
-        result = response.json()
+        response = session.post(api_url, data=verification_body, headers=FORM_HEADERS)
+        result = _loads(response.content)
         
         if result['status'] != '1':
-            print(f"❌ Verification failed: {result.get('result', 'Unknown error')}")
-            print(f"Response: {result}")
+            logger.error("❌ Verification failed: %s", result.get('result', 'Unknown error'))
+            logger.error("Response: %s", result)
             exit(1)
         
         guid = result['result']
-        print(f"✅ Submitted! GUID: {guid}")
+        logger.info("✅ Submitted! GUID: %s", guid)
         
-        # Check status
-        print("⏳ Checking status...")
-        for i in range(12):
-            time.sleep(5)
-            
-            check_data = {
-                'apikey': api_key,
-                'module': 'contract',
-                'action': 'checkverifystatus',
-                'guid': guid
-            }
+        # Check status right away (short submissions often resolve within a second or two); only while
+        # it is still pending, back off from ~1s up to 10s within the same one-minute budget
+        logger.info("⏳ Checking status...")
+        check_result = check_verify_status(session, api_url, api_key, guid)
+        logger.info("Status: %s", check_result.get('result', 'Unknown'))
+        delay = 1.0
+        deadline = time.monotonic() + 60
+        while not is_final_status(check_result) and time.monotonic() < deadline:
+            time.sleep(delay + random.uniform(0, delay * 0.2))
+            delay = min(delay * 1.6, 10.0)
             
-            check_response = requests.get(api_url, params=check_data)
-            check_result = check_response.json()
-            
-            print(f"Status: {check_result.get('result', 'Unknown')}")
-            
-            if check_result['status'] == '1':
-                print(f"\n✅ Contract verified successfully!")
-                print(f"🔗 View: https://gnosisscan.io/address/{contract_address}#code")
-                break
-            elif 'fail' in check_result.get('result', '').lower():
-                print(f"❌ Verification failed: {check_result.get('result')}")
-                break
+            check_result = check_verify_status(session, api_url, api_key, guid)
+            logger.info("Status: %s", check_result.get('result', 'Unknown'))
+        
+        if check_result['status'] == '1':
+            logger.info("\n✅ Contract verified successfully!")
+            logger.info("🔗 View: https://gnosisscan.io/address/%s#code", contract_address)
+        elif 'fail' in check_result.get('result', '').lower():
+            logger.error("❌ Verification failed: %s", check_result.get('result'))
+        else:
+            logger.error("⏰ Still pending after 60s; check status later with GUID %s", guid)
                 
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     main()
\ No newline at end of file
@@ -21,9 +21,13 @@ import os
 import json
 import logging
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Tuple, TypedDict
 
 from web3 import Web3
+from web3._utils.events import get_event_data
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
 from eth_typing import ChecksumAddress
 
 # ---- Robust import of your Balancer helper ----------------------------------
@@ -485,13 +489,30 @@ class Tx7702Executor:
             "router_address": self.router.address,
         }
 
+    @cached_property
+    def _trade_executed_abi(self) -> Dict[str, Any]:
+        # Looked up once per executor instead of rebuilding the event object for every receipt
+        return self.arb.events.TradeExecuted()._get_event_abi()
+
+    @cached_property
+    def _trade_executed_topic(self) -> bytes:
+        return bytes(event_abi_to_log_topic(self._trade_executed_abi))
+
     def decode_trade_executed(self, receipt) -> Optional[Tuple[int, int]]:
         """Return (amountIn, amountOut) from the first TradeExecuted event, if present."""
         try:
-            evts = self.arb.events.TradeExecuted().process_receipt(receipt)
-            if not evts:
-                return None
-            e0 = evts[0]["args"]
-            return int(e0["amountIn"]), int(e0["amountOut"])
+            event_abi = self._trade_executed_abi
+            topic = self._trade_executed_topic
+            for log in receipt["logs"]:
+                # Compare topic0 first so the inner swap/transfer logs are never ABI-decoded
+                topics = log.get("topics") or ()
+                if not topics or HexBytes(topics[0]) != topic:
+                    continue
+                try:
+                    args = get_event_data(self.w3.codec, event_abi, log)["args"]
+                except Exception:
+                    continue
+                return int(args["amountIn"]), int(args["amountOut"])
+            return None
         except Exception:
             return None
\ No newline at end of file
@@ -6,16 +6,34 @@ This module provides utilities for building EIP-7702 transactions that allow
 EOAs to temporarily act as smart contracts and execute batched operations.
 """
 
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from decimal import Decimal
 from web3 import Web3
 from eth_account import Account
-from eth_abi import encode
+from eth_abi.registry import registry
 from eth_utils import keccak
 import logging
 
+from src.setup.multicall import rpc_batch
+
 logger = logging.getLogger(__name__)
 
+MAX_UINT256 = (1 << 256) - 1
+
+# Function selectors, hashed once at import rather than on every add_* call
+APPROVE_SELECTOR = keccak(text="approve(address,uint256)")[:4]
+SPLIT_POSITION_SELECTOR = keccak(text="splitPosition(address,address,uint256)")[:4]
+MERGE_POSITIONS_SELECTOR = keccak(text="mergePositions(address,address,uint256)")[:4]
+SWAPR_EXACT_IN_SELECTOR = keccak(text="exactInputSingle((address,address,address,uint256,uint256,uint256,uint160))")[:4]
+EXECUTE10_SELECTOR = keccak(text="execute10(address[10],bytes[10],uint256)")[:4]
+
+# Argument encoders resolved from the ABI registry once; encode() would re-parse the type strings per call
+_ADDRESS_UINT256 = registry.get_encoder('(address,uint256)')
+_ADDRESS_ADDRESS_UINT256 = registry.get_encoder('(address,address,uint256)')
+_SWAPR_EXACT_IN_PARAMS = registry.get_encoder('(address,address,address,uint256,uint256,uint256,uint160)')
+_BYTES = registry.get_encoder('(bytes)')
+_EXECUTE10_ARGS = registry.get_encoder('(address[10],bytes[10],uint256)')
+
 
 class EIP7702TransactionBuilder:
     """Builder for EIP-7702 transactions with batched operations."""
@@ -58,15 +76,27 @@ class EIP7702TransactionBuilder:
         Args:
             token: Token contract address
             spender: Address to approve
-            amount: Amount to approve (use 2**256-1 for max)
+            amount: Amount to approve (use MAX_UINT256 for max)
         """
         # approve(address,uint256)
-        function_selector = keccak(text="approve(address,uint256)")[:4]
-        encoded_params = encode(['address', 'uint256'], [Web3.to_checksum_address(spender), amount])
+        function_selector = APPROVE_SELECTOR
+        encoded_params = _ADDRESS_UINT256((Web3.to_checksum_address(spender), amount))
         data = function_selector + encoded_params
         
         return self.add_call(token, 0, data)
     
+    def add_approvals_batch(self, approvals: List[Tuple[str, str, int]]) -> "EIP7702TransactionBuilder":
+        """
+        Add several ERC20 approval calls, in the given order.
+        
+        Args:
+            approvals: (token, spender, amount) tuples
+        """
+        for token, spender, amount in approvals:
+            data = APPROVE_SELECTOR + _ADDRESS_UINT256((Web3.to_checksum_address(spender), amount))
+            self.add_call(token, 0, data)
+        return self
+    
     def add_futarchy_split(self, router: str, proposal: str, collateral: str, amount: int) -> "EIP7702TransactionBuilder":
         """
         Add FutarchyRouter splitPosition call.
@@ -78,10 +108,9 @@ class EIP7702TransactionBuilder:
             amount: Amount to split (in wei)
         """
         # splitPosition(address,address,uint256)
-        function_selector = keccak(text="splitPosition(address,address,uint256)")[:4]
-        encoded_params = encode(
-            ['address', 'address', 'uint256'],
-            [Web3.to_checksum_address(proposal), Web3.to_checksum_address(collateral), amount]
+        function_selector = SPLIT_POSITION_SELECTOR
+        encoded_params = _ADDRESS_ADDRESS_UINT256(
+            (Web3.to_checksum_address(proposal), Web3.to_checksum_address(collateral), amount)
         )
         data = function_selector + encoded_params
         
@@ -98,10 +127,9 @@ class EIP7702TransactionBuilder:
             amount: Amount to merge (in wei)
         """
         # mergePositions(address,address,uint256)
-        function_selector = keccak(text="mergePositions(address,address,uint256)")[:4]
-        encoded_params = encode(
-            ['address', 'address', 'uint256'],
-            [Web3.to_checksum_address(proposal), Web3.to_checksum_address(collateral), amount]
+        function_selector = MERGE_POSITIONS_SELECTOR
+        encoded_params = _ADDRESS_ADDRESS_UINT256(
+            (Web3.to_checksum_address(proposal), Web3.to_checksum_address(collateral), amount)
         )
         data = function_selector + encoded_params
         
@@ -124,12 +152,11 @@ class EIP7702TransactionBuilder:
             sqrt_price_limit: Square root price limit (0 for no limit)
         """
         # exactInputSingle((address,address,address,uint256,uint256,uint256,uint160))
-        function_selector = keccak(text="exactInputSingle((address,address,address,uint256,uint256,uint256,uint160))")[:4]
+        function_selector = SWAPR_EXACT_IN_SELECTOR
         
         # Encode the struct as a tuple
-        struct_data = encode(
-            ['address', 'address', 'address', 'uint256', 'uint256', 'uint256', 'uint160'],
-            [
+        struct_data = _SWAPR_EXACT_IN_PARAMS(
+            (
                 Web3.to_checksum_address(token_in),
                 Web3.to_checksum_address(token_out),
                 Web3.to_checksum_address(recipient),
@@ -137,15 +164,16 @@ class EIP7702TransactionBuilder:
                 amount_in,
                 amount_out_min,
                 sqrt_price_limit
-            ]
+            )
         )
         
         # Encode the entire function call
-        data = function_selector + encode(['bytes'], [struct_data])
+        data = function_selector + _BYTES((struct_data,))
         
         return self.add_call(router, 0, data)
     
-    def build_authorization(self, account: Account, nonce: Optional[int] = None) -> Dict[str, Any]:
+    def build_authorization(self, account: Account, nonce: Optional[int] = None,
+                            chain_id: Optional[int] = None) -> Dict[str, Any]:
         """
         Build and sign the EIP-7702 authorization.
         
@@ -153,6 +181,7 @@ class EIP7702TransactionBuilder:
             account: Account instance to sign with
             nonce: Authorization nonce (if None, defaults to current account nonce)
                    Note: When auth signer == tx signer, use account.nonce + 1
+            chain_id: Chain ID to authorize on (if None, read from the node)
             
         Returns:
             Signed authorization dictionary
@@ -160,9 +189,11 @@ class EIP7702TransactionBuilder:
         if nonce is None:
             # Get current account nonce
             nonce = self.w3.eth.get_transaction_count(account.address)
+        if chain_id is None:
+            chain_id = self.w3.eth.chain_id
             
         auth = {
-            "chainId": self.w3.eth.chain_id,
+            "chainId": chain_id,
             "address": self.implementation_address,
             "nonce": nonce
         }
@@ -196,7 +227,7 @@ class EIP7702TransactionBuilder:
             raise ValueError(f"Too many calls for execute10: {len(self.calls)} (max 10)")
         
         # execute10(address[10],bytes[10],uint256)
-        function_selector = keccak(text="execute10(address[10],bytes[10],uint256)")[:4]
+        function_selector = EXECUTE10_SELECTOR
         
         # Build fixed-size arrays
         targets = []
@@ -214,13 +245,30 @@ class EIP7702TransactionBuilder:
         
         # Encode parameters
         count = len(self.calls)
-        encoded_params = encode(
-            ['address[10]', 'bytes[10]', 'uint256'],
-            [targets, calldatas, count]
-        )
+        encoded_params = _EXECUTE10_ARGS((targets, calldatas, count))
         
         return function_selector + encoded_params
     
+    def _chain_state(self, address: str, need_block: bool) -> Tuple[int, int, Optional[int]]:
+        """(nonce, chain id, latest base fee or None) in one JSON-RPC batch POST.
+
+        The block is only requested when need_block is set. Falls back to separate
+        calls when the provider is not HTTP or the endpoint rejects batches.
+        """
+        calls = [("eth_getTransactionCount", [address, "latest"]), ("eth_chainId", [])]
+        if need_block:
+            calls.append(("eth_getBlockByNumber", ["latest", False]))
+        try:
+            replies = rpc_batch(self.w3, calls)
+            nonce, chain_id = int(replies[0], 16), int(replies[1], 16)
+            base_fee = (replies[2] or {}).get('baseFeePerGas') if need_block else None
+            return nonce, chain_id, int(base_fee, 16) if base_fee is not None else None
+        except Exception:
+            nonce = self.w3.eth.get_transaction_count(address)
+            chain_id = self.w3.eth.chain_id
+            base_fee = self.w3.eth.get_block('latest').get('baseFeePerGas') if need_block else None
+            return nonce, chain_id, base_fee
+    
     def build_transaction(self, account: Account, gas_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Build the complete EIP-7702 transaction.
@@ -232,21 +280,20 @@ class EIP7702TransactionBuilder:
         Returns:
             Complete transaction dictionary ready for signing
         """
-        # Get current nonce
-        nonce = self.w3.eth.get_transaction_count(account.address)
+        nonce, chain_id, base_fee = self._chain_state(account.address, need_block=gas_params is None)
         
         # Build authorization
         # When the authorization signer is the same as the transaction signer,
         # the authorization nonce should be account.nonce + 1
-        signed_auth = self.build_authorization(account, nonce + 1)
+        signed_auth = self.build_authorization(account, nonce + 1, chain_id=chain_id)
         
         # Build batch call data
         call_data = self.build_batch_call_data()
         
         # Default gas parameters
         if gas_params is None:
-            latest_block = self.w3.eth.get_block('latest')
-            base_fee = latest_block.get('baseFeePerGas', self.w3.eth.gas_price)
+            if base_fee is None:
+                base_fee = self.w3.eth.gas_price
             priority_fee = self.w3.to_wei(2, 'gwei')
             
             gas_params = {
@@ -258,7 +305,7 @@ class EIP7702TransactionBuilder:
         # Build transaction
         tx = {
             'type': 4,  # EIP-7702 transaction type
-            'chainId': self.w3.eth.chain_id,
+            'chainId': chain_id,
             'nonce': nonce,
             'to': account.address,  # Send to self
             'value': 0,
@@ -318,6 +365,6 @@ def create_test_transaction(w3: Web3, implementation_address: str, account: Acco
     test_token = "0x0000000000000000000000000000000000000001"  # Dummy address
     test_spender = "0x0000000000000000000000000000000000000002"  # Dummy address
     
-    builder.add_approval(test_token, test_spender, 2**256 - 1)
+    builder.add_approval(test_token, test_spender, MAX_UINT256)
     
     return builder.build_transaction(account)
\ No newline at end of file
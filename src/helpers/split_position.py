@@ -33,7 +33,7 @@ result = simulate_split(
 ```
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 import os
 import logging
 from web3 import Web3
@@ -91,8 +91,12 @@ def simulate_split(
     collateral_addr: str,
     amount_wei: int,
     sender: str,
+    parse: Optional[Callable[[List[Dict[str, Any]], Web3], None]] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Convenience function: build tx → simulate → return result dict."""
+    """Convenience function: build tx → simulate → return result dict.
+
+    ``parse`` handles the simulation results (default: parse_split_results).
+    """
     tx = build_split_tx(
         w3,
         client,
@@ -104,7 +108,7 @@ def simulate_split(
     )
     result = client.simulate([tx])
     if result and result.get("simulation_results"):
-        parse_split_results(result["simulation_results"], w3)
+        (parse or parse_split_results)(result["simulation_results"], w3)
     else:
         logger.debug("Simulation failed or returned no results.")
     return result
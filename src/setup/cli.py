@@ -2,18 +2,17 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
-from eth_account import Account
-from eth_utils import to_checksum_address
 try:
-    from dotenv import load_dotenv
+    from dotenv import load_dotenv as _dotenv_load
 except Exception:
-    def load_dotenv(path: Optional[str] = None):
+    def _dotenv_load(path: Optional[str] = None, override: bool = False):
         """Lightweight .env loader fallback: KEY=VALUE per line, supports optional 'export ' prefix."""
         if not path:
             return False
@@ -32,45 +31,106 @@ except Exception:
             return True
         except Exception:
             return False
+
+
+@functools.lru_cache(maxsize=16)
+def _load_dotenv_cached(path: str, mtime_ns: int) -> bool:
+    return bool(_dotenv_load(path, override=False))
+
+
+def load_dotenv(path: Optional[str] = None) -> bool:
+    """Load a .env file without overriding existing env vars; unchanged files are parsed once per process."""
+    if not path:
+        return False
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return False
+    return _load_dotenv_cached(os.path.abspath(path), mtime_ns)
+
+
 import secrets
 import string
 
-from .keystore import (
-    encrypt_private_key,
-    decrypt_keystore,
-    resolve_password,
-    write_keystore,
-    read_keystore,
-    write_env_private_key,
-    derive_privkey_from_mnemonic,
-)
-from .wallet_manager import (
-    load_index,
-    save_index,
-    scan_keystores,
-    derive_hd_batch,
-    create_random_wallets,
-    import_private_keys,
-    upsert_record,
-)
-from .fund_xdai import fund_xdai as _fund_xdai, GasConfig as _GasConfig
-from .fund_erc20 import fund_erc20 as _fund_erc20, GasConfig as _GasConfig20
-from .deploy_v5 import deploy_v5 as _deploy_v5
-from .deploy_v5 import DeployGasConfig as _DeployGasConfig
-from .deployment_links import find_by_path as _find_deploy_link_by_path
+# eth-account, web3 and the keystore/funding/deploy modules are imported inside the
+# handlers that need them so that `--help` and light subcommands start quickly.
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_paths_cached(out: Optional[str], index: Optional[str]) -> Tuple[Path, Path]:
+    out_dir = Path(out or "build/wallets")
+    index_path = Path(index) if index else (out_dir / "index.json")
+    return out_dir, index_path
+
+
+def _resolve_paths(args: argparse.Namespace) -> Tuple[Path, Path]:
+    """Return (out_dir, index_path) for a subcommand, defaulting to build/wallets and <out>/index.json."""
+    return _resolve_paths_cached(getattr(args, "out", None), getattr(args, "index", None))
+
+
+@functools.lru_cache(maxsize=8)
+def _scan_keystores_cached(out_dir: str, mtime_ns: int) -> list:
+    from .wallet_manager import scan_keystores
+
+    return scan_keystores(Path(out_dir))
+
+
+# Below this many paths, process-pool startup costs more than it saves
+_PARALLEL_DERIVE_MIN = 32
+
+
+def _derive_privkey_job(job: Tuple[str, str]) -> str:
+    from .keystore import derive_privkey_from_mnemonic
+
+    mnemonic, path = job
+    return derive_privkey_from_mnemonic(mnemonic, path)[0]
+
+
+def _derive_privkeys(mnemonic: str, paths: list) -> list:
+    """Derive private keys for paths (in order), fanning out to a process pool for large batches."""
+    from .keystore import derive_privkey_from_mnemonic
+
+    workers = min(len(paths), os.cpu_count() or 1)
+    if len(paths) < _PARALLEL_DERIVE_MIN or workers < 2:
+        return [derive_privkey_from_mnemonic(mnemonic, path)[0] for path in paths]
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = [(mnemonic, path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_derive_privkey_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def _seed_env_text(mnemonic: str, password: str, path_base: str) -> str:
+    return f"MNEMONIC='{mnemonic}'\nWALLET_KEYSTORE_PASSWORD={password}\nHD_PATH_BASE=\"{path_base}\"\n"
+
+
+_HD_ENABLED = False
+
+
+def _ensure_hd() -> None:
+    """Enable eth-account's (unaudited) HD wallet features once per process."""
+    global _HD_ENABLED
+    if not _HD_ENABLED:
+        from eth_account import Account
+
+        Account.enable_unaudited_hdwallet_features()
+        _HD_ENABLED = True
 
 
 def cmd_keystore_create(args: argparse.Namespace) -> int:
     try:
+        from eth_account import Account
+        from .keystore import encrypt_private_key, encrypt_private_key_bytes, resolve_password, write_keystore, write_env_private_key
+
         # Optionally load env file for PRIVATE_KEY / password
         if args.env_file:
             load_dotenv(args.env_file)
 
         # Determine private key source: --private-key > --private-key-env/env > --random
         priv_hex: Optional[str] = None
+        priv_bytes: Optional[bytes] = None
         if args.random:
-            acct = Account.create()
-            priv_hex = "0x" + bytes(acct.key).hex()
+            priv_bytes = bytes(Account.create().key)
         elif args.private_key:
             priv_hex = args.private_key
         else:
@@ -81,14 +141,19 @@ def cmd_keystore_create(args: argparse.Namespace) -> int:
                 priv_hex = pk_env
             else:
                 # default to random if neither provided (backward-compatible)
-                acct = Account.create()
-                priv_hex = "0x" + bytes(acct.key).hex()
+                priv_bytes = bytes(Account.create().key)
 
         # Resolve password
         password = resolve_password(args.keystore_pass, args.keystore_pass_env, args.private_key_env or "PRIVATE_KEY")
-        keystore, address = encrypt_private_key(priv_hex, password)
+        if priv_bytes is not None:
+            # Random keys stay as bytes; only hex-encode if the plaintext key is actually needed
+            keystore, address = encrypt_private_key_bytes(priv_bytes, password, args.kdf, args.kdf_iters)
+            if args.emit_env or args.show_private_key:
+                priv_hex = "0x" + priv_bytes.hex()
+        else:
+            keystore, address = encrypt_private_key(priv_hex, password, args.kdf, args.kdf_iters)
 
-        out_dir = Path(args.out or "build/wallets")
+        out_dir, _ = _resolve_paths(args)
         ks_path = write_keystore(out_dir, address, keystore)
 
         print(f"Created keystore: {ks_path}")
@@ -115,6 +180,8 @@ def cmd_keystore_create(args: argparse.Namespace) -> int:
 
 def cmd_keystore_decrypt(args: argparse.Namespace) -> int:
     try:
+        from .keystore import decrypt_keystore, describe_kdf, resolve_password, read_keystore
+
         # Optionally load env file for password resolution
         if args.env_file:
             load_dotenv(args.env_file)
@@ -125,10 +192,8 @@ def cmd_keystore_decrypt(args: argparse.Namespace) -> int:
             return 1
         keystore_json = read_keystore(path)
         password = resolve_password(args.keystore_pass, args.keystore_pass_env, args.private_key_env or "PRIVATE_KEY")
-        priv_hex = decrypt_keystore(keystore_json, password)
-
-        # Derive address
-        address = to_checksum_address(Account.from_key(priv_hex).address)
+        print(f"KDF: {describe_kdf(keystore_json)}", file=sys.stderr)
+        priv_hex, address = decrypt_keystore(keystore_json, password)
         print(f"Address: {address}")
 
         if args.show_private_key:
@@ -145,6 +210,586 @@ def cmd_keystore_decrypt(args: argparse.Namespace) -> int:
         return 1
 
 
+def _cmd_hd(args: argparse.Namespace) -> int:
+    try:
+        from .keystore import encrypt_private_key, resolve_password, write_keystore, write_env_private_key, derive_privkey_from_mnemonic
+
+        if args.env_file:
+            load_dotenv(args.env_file)
+        mnemonic = args.mnemonic or os.getenv(args.mnemonic_env)  # type: ignore[arg-type]
+        if not mnemonic:
+            print("Mnemonic not provided (use --mnemonic or --mnemonic-env)", file=sys.stderr)
+            return 2
+        priv_hex, address = derive_privkey_from_mnemonic(mnemonic.strip(), args.path)
+        password = resolve_password(args.keystore_pass, args.keystore_pass_env, "PRIVATE_KEY")
+        keystore, _ = encrypt_private_key(priv_hex, password, args.kdf, args.kdf_iters)
+        out_dir, _ = _resolve_paths(args)
+        ks_path = write_keystore(out_dir, address, keystore)
+        print(f"Derived {address} at {args.path}")
+        print(f"Created keystore: {ks_path}")
+        if args.emit_env:
+            if not args.insecure_plain:
+                print("Refusing to write plaintext env without --insecure-plain", file=sys.stderr)
+                return 2
+            env_path = write_env_private_key(out_dir, address, priv_hex)
+            print(f"Wrote plaintext env (insecure): {env_path}")
+        if args.show_private_key:
+            if not args.insecure_plain:
+                print("Refusing to print private key without --insecure-plain", file=sys.stderr)
+                return 2
+            print(f"Private key: {priv_hex}")
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_hd_new(args: argparse.Namespace) -> int:
+    try:
+        from eth_account import Account
+        from .keystore import encrypt_private_keys, write_keystores_batch, write_secret_file
+
+        # Enable HD features and generate mnemonic
+        _ensure_hd()
+        acct, mnemonic = Account.create_with_mnemonic()
+
+        # Resolve password: provided or generate ephemeral
+        if args.keystore_pass:
+            password = args.keystore_pass
+        else:
+            # Generate a 192-bit hex password (hex is a C fast path; no base64/strip step)
+            password = secrets.token_hex(24)
+
+        out_dir, _ = _resolve_paths(args)
+
+        print("Deriving accounts:")
+        paths = [f"{args.path_base}/{i}" for i in range(int(args.count))]
+        priv_hexes = _derive_privkeys(mnemonic, paths)
+        # All keystores share one password, so derive the KDF key once for the batch
+        encrypted = encrypt_private_keys(priv_hexes, password, args.kdf, args.kdf_iters)
+        ks_paths = write_keystores_batch(out_dir, [(address, keystore) for keystore, address in encrypted])
+        derived = []
+        for i, (path, (_, address), ks_path) in enumerate(zip(paths, encrypted, ks_paths)):
+            derived.append({"index": i, "path": path, "address": address, "keystore": str(ks_path)})
+            print(f"  [{i}] {address} @ {path} -> {ks_path}")
+
+        if args.print_secrets or not args.keystore_pass:
+            print("\nSECRETS (Handle carefully; not stored anywhere):")
+            print(f"Mnemonic: {mnemonic}")
+            print(f"Keystore password: {password}")
+
+        # Optionally write seed env for future runs
+        if args.write_seed_env:
+            try:
+                target = Path(args.seed_env_file or ".env.seed")
+                if target.exists() and not args.overwrite_seed_env:
+                    print(f"Seed env file already exists at {target}; skipping write (use --overwrite-seed-env to replace)")
+                else:
+                    write_secret_file(target, _seed_env_text(mnemonic, password, args.path_base))
+                    print(f"Wrote seed env to {target}")
+            except Exception as e:
+                print(f"Warning: failed to write seed env: {e}", file=sys.stderr)
+
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_hd_from_env(args: argparse.Namespace) -> int:
+    try:
+        from eth_account import Account
+        from .keystore import encrypt_private_key, resolve_password, write_keystore, write_secret_file, derive_privkey_from_mnemonic
+
+        # Load source env to get PRIVATE_KEY
+        load_dotenv(args.env_file)
+        pk = os.getenv("PRIVATE_KEY")
+        if not pk:
+            print("PRIVATE_KEY not found in --env-file", file=sys.stderr)
+            return 2
+        # Derive keystore password deterministically from PRIVATE_KEY
+        password = resolve_password(None, None, "PRIVATE_KEY")
+
+        # Create mnemonic and derive batch
+        _ensure_hd()
+        acct, mnemonic = Account.create_with_mnemonic()
+
+        out_dir, _ = _resolve_paths(args)
+        base = args.path_base
+        print("Deriving accounts:")
+        for i in range(int(args.count)):
+            path = f"{base}/{i}"
+            priv_hex, address = derive_privkey_from_mnemonic(mnemonic, path)
+            keystore, _ = encrypt_private_key(priv_hex, password)
+            ks_path = write_keystore(out_dir, address, keystore)
+            print(f"  [{i}] {address} @ {path} -> {ks_path}")
+
+        # Write out .env with MNEMONIC and WALLET_KEYSTORE_PASSWORD for future runs
+        out_env = write_secret_file(Path(args.out_env), _seed_env_text(mnemonic, password, base))
+        print(f"Wrote seed env: {out_env}")
+        if args.print_secrets:
+            print("\nSECRETS (Copied to out-env):")
+            print(f"Mnemonic: {mnemonic}")
+            print(f"Keystore password: {password}")
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    try:
+        from .keystore import resolve_password, getenv_first
+        from .wallet_manager import load_index, save_index, derive_hd_batch, create_random_wallets, upsert_record
+
+        if args.env_file:
+            load_dotenv(args.env_file)
+        out_dir, index_path = _resolve_paths(args)
+        # Resolve or generate password
+        if args.generate_password:
+            password = secrets.token_urlsafe(32)
+        else:
+            # Fallback to PRIVATE_KEY-derived if no WALLET_KEYSTORE_PASSWORD
+            password = resolve_password(args.keystore_pass, args.keystore_pass_env, "PRIVATE_KEY")
+        # Create records
+        if args.mode == "hd":
+            # Resolve mnemonic from CLI or env (.env provides MNEMONIC)
+            mnemonic = args.mnemonic or getenv_first(args.mnemonic_env, "MNEMONIC")
+            if not mnemonic:
+                print("HD mode requires MNEMONIC in --env-file or via --mnemonic/--mnemonic-env", file=sys.stderr)
+                return 2
+            # Resolve base derivation path from env if provided
+            path_base = os.getenv("HD_PATH_BASE") or args.path_base
+            new_records = derive_hd_batch(mnemonic.strip(), path_base, args.start, args.count, password, out_dir, tags=args.tag or [], emit_env=args.emit_env, insecure_plain=args.insecure_plain, use_pool=not args.disable_pool)
+        else:
+            new_records = create_random_wallets(args.count, password, out_dir, tags=args.tag or [], emit_env=args.emit_env, insecure_plain=args.insecure_plain, use_pool=not args.disable_pool)
+
+        # Update index
+        existing = load_index(index_path)
+        for rec in new_records:
+            existing = upsert_record(existing, rec)
+        save_index(index_path, existing)
+
+        print(f"Generated {len(new_records)} wallet(s). Index: {index_path}")
+        for r in new_records:
+            print(f" - {r['address']} -> {r['keystore_path']}" + (f" @ {r.get('path')}" if r.get('path') else ""))
+
+        # Optionally write the keystore password to an env file
+        if args.write_password:
+            try:
+                target_env = Path(args.password_file or args.env_file or ".env")
+                target_env.parent.mkdir(parents=True, exist_ok=True)
+                existing_text = target_env.read_text() if target_env.exists() else ""
+                exists = any(line.strip().startswith("WALLET_KEYSTORE_PASSWORD=") for line in existing_text.splitlines())
+                if exists and not args.overwrite_password:
+                    print(f"WALLET_KEYSTORE_PASSWORD already present in {target_env}; skipping (use --overwrite-password to replace)")
+                else:
+                    lines = [] if not existing_text else [ln for ln in existing_text.splitlines() if not ln.strip().startswith("WALLET_KEYSTORE_PASSWORD=")]
+                    lines.append(f"WALLET_KEYSTORE_PASSWORD={password}")
+                    target_env.write_text("\n".join(lines) + "\n")
+                    print(f"Wrote WALLET_KEYSTORE_PASSWORD to {target_env}")
+            except Exception as e:
+                print(f"Warning: failed to write WALLET_KEYSTORE_PASSWORD: {e}", file=sys.stderr)
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_list(args: argparse.Namespace) -> int:
+    try:
+        from .wallet_manager import load_index
+
+        out_dir, index_path = _resolve_paths(args)
+        records = load_index(index_path)
+        if not records:
+            # fallback: scan (memoized on the directory mtime, which changes when keystores are added/removed)
+            try:
+                records = _scan_keystores_cached(str(out_dir), os.stat(out_dir).st_mtime_ns)
+            except FileNotFoundError:
+                records = []
+        if args.format == "json":
+            print(json.dumps({"wallets": records}, indent=2))
+        else:
+            # One write per chunk instead of one print() per record (large wallet dirs)
+            for start in range(0, len(records), 1000):
+                lines = [
+                    f"{r.get('address')} | {r.get('path', '-')} | {','.join(r.get('tags', [])) or '-'} | {r.get('keystore_path')}"
+                    for r in records[start:start + 1000]
+                ]
+                sys.stdout.write("\n".join(lines) + "\n")
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_import(args: argparse.Namespace) -> int:
+    try:
+        from .keystore import resolve_password
+        from .wallet_manager import load_index, save_index, import_private_keys
+
+        if args.env_file:
+            load_dotenv(args.env_file)
+        out_dir, index_path = _resolve_paths(args)
+        password = resolve_password(args.keystore_pass, args.keystore_pass_env)
+        keys: List[str] = []
+        if args.file:
+            with open(args.file, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        keys.append(line)
+        else:
+            keys = args.key or []
+        new_records = import_private_keys(keys, password, out_dir, tags=args.tag or [], emit_env=args.emit_env, insecure_plain=args.insecure_plain, use_pool=not args.disable_pool)
+        existing = load_index(index_path)
+        # simple merge avoiding duplicates
+        seen = {r.get('address') for r in existing}
+        for r in new_records:
+            if r['address'] not in seen:
+                existing.append(r)
+                seen.add(r['address'])
+        save_index(index_path, existing)
+        print(f"Imported {len(new_records)} key(s). Index: {index_path}")
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_fund_xdai(args: argparse.Namespace) -> int:
+    try:
+        from decimal import Decimal
+        from .fund_xdai import fund_xdai as _fund_xdai, GasConfig as _GasConfig
+
+        out_dir, index_path = _resolve_paths(args)
+        # Gas config
+        if args.legacy:
+            gas = _GasConfig(type="legacy", gas_limit=int(args.gas_limit), gas_price_gwei=Decimal(str(args.gas_price_gwei)))
+        else:
+            gas = _GasConfig(
+                type="eip1559",
+                gas_limit=int(args.gas_limit),
+                max_fee_gwei=Decimal(str(args.max_fee_gwei)),
+                prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
+            )
+        log_path = Path(args.log) if args.log else None
+        rc = _fund_xdai(
+            out_dir=out_dir,
+            index_path=index_path,
+            amount_eth=str(args.amount),
+            from_env=args.from_env,
+            env_file=args.env_file,
+            rpc_url=args.rpc_url,
+            chain_id=int(args.chain_id),
+            only=args.only,
+            only_path=args.only_path,
+            ensure_paths=args.ensure_path,
+            ensure_mnemonic=args.mnemonic,
+            ensure_mnemonic_env=args.mnemonic_env,
+            keystore_pass=args.keystore_pass,
+            keystore_pass_env=args.keystore_pass_env,
+            always_send=bool(args.always),
+            gas=gas,
+            timeout=int(args.timeout),
+            dry_run=bool(args.dry_run),
+            log_path=log_path,
+            require_confirm=not bool(args.confirm),
+        )
+        return int(rc)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_fund_sdai(args: argparse.Namespace) -> int:
+    try:
+        from decimal import Decimal
+        from .fund_erc20 import fund_erc20 as _fund_erc20, GasConfig as _GasConfig20
+
+        out_dir, index_path = _resolve_paths(args)
+        # Token resolution
+        token = args.token or os.getenv("SDAI_TOKEN_ADDRESS")
+        # Gas config
+        if args.legacy:
+            gas = _GasConfig20(type="legacy", gas_limit=int(args.gas_limit), gas_price_gwei=Decimal(str(args.gas_price_gwei)))
+        else:
+            gas = _GasConfig20(
+                type="eip1559",
+                gas_limit=int(args.gas_limit),
+                max_fee_gwei=Decimal(str(args.max_fee_gwei)),
+                prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
+            )
+        log_path = Path(args.log) if args.log else None
+        rc = _fund_erc20(
+            token=token,
+            out_dir=out_dir,
+            index_path=index_path,
+            amount_token=str(args.amount),
+            from_env=args.from_env,
+            env_file=args.env_file,
+            rpc_url=args.rpc_url,
+            chain_id=int(args.chain_id),
+            only=args.only,
+            only_path=args.only_path,
+            ensure_paths=args.ensure_path,
+            ensure_mnemonic=args.mnemonic,
+            ensure_mnemonic_env=args.mnemonic_env,
+            keystore_pass=args.keystore_pass,
+            keystore_pass_env=args.keystore_pass_env,
+            always_send=bool(args.always),
+            gas=gas,
+            timeout=int(args.timeout),
+            dry_run=bool(args.dry_run),
+            log_path=log_path,
+            require_confirm=not bool(args.confirm),
+            reuse_log_secs=args.reuse_log_secs,
+        )
+        return int(rc)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_fund_all(args: argparse.Namespace) -> int:
+    try:
+        from decimal import Decimal
+        from .fund_xdai import fund_xdai as _fund_xdai, GasConfig as _GasConfig
+        from .fund_erc20 import fund_erc20 as _fund_erc20, GasConfig as _GasConfig20
+
+        if not args.xdai and not args.sdai:
+            print("Provide at least one of --xdai or --sdai", file=sys.stderr)
+            return 2
+
+        out_dir, index_path = _resolve_paths(args)
+
+        # Gas configs
+        xdai_gas = (_GasConfig(type="legacy", gas_limit=int(args.xdai_gas_limit), gas_price_gwei=Decimal(str(args.xdai_gas_price_gwei)))
+                    if args.xdai_legacy else
+                    _GasConfig(type="eip1559", gas_limit=int(args.xdai_gas_limit), max_fee_gwei=Decimal(str(args.xdai_max_fee_gwei)), prio_fee_gwei=Decimal(str(args.xdai_priority_fee_gwei))))
+
+        sdai_gas = (_GasConfig20(type="legacy", gas_limit=int(args.sdai_gas_limit), gas_price_gwei=Decimal(str(args.sdai_gas_price_gwei)))
+                    if args.sdai_legacy else
+                    _GasConfig20(type="eip1559", gas_limit=int(args.sdai_gas_limit), max_fee_gwei=Decimal(str(args.sdai_max_fee_gwei)), prio_fee_gwei=Decimal(str(args.sdai_priority_fee_gwei))))
+
+        # Execute requested legs
+        overall_rc = 0
+        if args.xdai:
+            rc_x = _fund_xdai(
+                out_dir=out_dir,
+                index_path=index_path,
+                amount_eth=str(args.xdai),
+                from_env=args.from_env,
+                env_file=args.env_file,
+                rpc_url=args.rpc_url,
+                chain_id=int(args.chain_id),
+                only=args.only,
+                only_path=args.only_path,
+                ensure_paths=args.ensure_path,
+                ensure_mnemonic=args.mnemonic,
+                ensure_mnemonic_env=args.mnemonic_env,
+                keystore_pass=args.keystore_pass,
+                keystore_pass_env=args.keystore_pass_env,
+                always_send=bool(args.always),
+                gas=xdai_gas,
+                timeout=int(args.timeout),
+                dry_run=bool(args.dry_run),
+                log_path=None,
+                require_confirm=not bool(args.confirm),
+            )
+            overall_rc = max(overall_rc, int(rc_x))
+
+        if args.sdai:
+            token = args.token or os.getenv("SDAI_TOKEN_ADDRESS")
+            rc_s = _fund_erc20(
+                token=token,
+                out_dir=out_dir,
+                index_path=index_path,
+                amount_token=str(args.sdai),
+                from_env=args.from_env,
+                env_file=args.env_file,
+                rpc_url=args.rpc_url,
+                chain_id=int(args.chain_id),
+                only=args.only,
+                only_path=args.only_path,
+                ensure_paths=args.ensure_path,
+                ensure_mnemonic=args.mnemonic,
+                ensure_mnemonic_env=args.mnemonic_env,
+                keystore_pass=args.keystore_pass,
+                keystore_pass_env=args.keystore_pass_env,
+                always_send=bool(args.always),
+                gas=sdai_gas,
+                timeout=int(args.timeout),
+                dry_run=bool(args.dry_run),
+                log_path=None,
+                require_confirm=not bool(args.confirm),
+            )
+            overall_rc = max(overall_rc, int(rc_s))
+
+        return int(overall_rc)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_deploy_v5(args: argparse.Namespace) -> int:
+    try:
+        from decimal import Decimal
+        from .deploy_v5 import deploy_v5 as _deploy_v5, DeployGasConfig as _DeployGasConfig
+
+        out_dir, index_path = _resolve_paths(args)
+
+        # Gas config
+        if args.legacy:
+            gas = _DeployGasConfig(
+                type="legacy",
+                gas_limit=int(args.gas_limit),
+                gas_price_gwei=Decimal(str(args.gas_price_gwei)),
+            )
+        else:
+            gas = _DeployGasConfig(
+                type="eip1559",
+                gas_limit=int(args.gas_limit),
+                max_fee_gwei=Decimal(str(args.max_fee_gwei)),
+                prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
+            )
+
+        log_path = Path(args.log) if args.log else None
+
+        rc = _deploy_v5(
+            path=args.path,
+            out_dir=out_dir,
+            index_path=index_path,
+            ensure_path=bool(args.ensure_path),
+            ensure_mnemonic=args.mnemonic,
+            ensure_mnemonic_env=args.mnemonic_env,
+            keystore_pass=args.keystore_pass,
+            keystore_pass_env=args.keystore_pass_env,
+            env_file=args.env_file,
+            rpc_url=args.rpc_url,
+            chain_id=int(args.chain_id),
+            gas=gas,
+            timeout=int(args.timeout),
+            dry_run=bool(args.dry_run),
+            log_path=log_path,
+            require_confirm=not bool(args.confirm),
+            fund_xdai_eth=(str(args.fund_xdai) if args.fund_xdai else None),
+            funder_env=args.funder_env,
+        )
+        return int(rc)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _cmd_deploy_v5_linked(args: argparse.Namespace) -> int:
+    try:
+        from decimal import Decimal
+        import subprocess, json as _json
+        from .deploy_v5 import deploy_v5 as _deploy_v5, DeployGasConfig as _DeployGasConfig
+        from .deployment_links import find_by_path as _find_deploy_link_by_path
+
+        out_dir, index_path = _resolve_paths(args)
+
+        # Gas config
+        if args.legacy:
+            gas = _DeployGasConfig(
+                type="legacy",
+                gas_limit=int(args.gas_limit),
+                gas_price_gwei=Decimal(str(args.gas_price_gwei)),
+            )
+        else:
+            gas = _DeployGasConfig(
+                type="eip1559",
+                gas_limit=int(args.gas_limit),
+                max_fee_gwei=Decimal(str(args.max_fee_gwei)),
+                prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
+            )
+
+        log_path = Path(args.log) if args.log else None
+
+        # Execute deploy with pre-fund option (xDAI). Deploy function itself funds before sending tx.
+        rc = _deploy_v5(
+            path=args.path,
+            out_dir=out_dir,
+            index_path=index_path,
+            ensure_path=bool(args.ensure_path),
+            ensure_mnemonic=args.mnemonic,
+            ensure_mnemonic_env=args.mnemonic_env,
+            keystore_pass=args.keystore_pass,
+            keystore_pass_env=args.keystore_pass_env,
+            env_file=args.env_file,
+            rpc_url=args.rpc_url,
+            chain_id=int(args.chain_id),
+            gas=gas,
+            timeout=int(args.timeout),
+            dry_run=bool(args.dry_run),
+            log_path=log_path,
+            require_confirm=not bool(args.confirm),
+            fund_xdai_eth=(str(args.fund_xdai) if args.fund_xdai else None),
+            funder_env=args.funder_env,
+        )
+        if int(rc) != 0:
+            return int(rc)
+
+        # Resolve deployed address from logs by path
+        link = _find_deploy_link_by_path(args.path)
+        if not link:
+            print("Warning: could not resolve deployed address from logs; ensure logs exist and include address.", file=sys.stderr)
+            return 0
+        print(_json.dumps({"path": link.path, "address": link.address, "deployer": link.deployer, "tx": link.tx}, indent=2))
+
+        # Optionally fund sDAI to the executor contract after deployment
+        if args.fund_sdai:
+            cmd = [
+                sys.executable, "-m", "src.arbitrage_commands.fund_executor",
+                "--amount", str(args.fund_sdai),
+                "--address", link.address,
+            ]
+            if args.env_file:
+                cmd.extend(["--env", args.env_file])
+            print(f"Funding executor with sDAI: {' '.join(cmd)}")
+            res = subprocess.run(cmd, text=True)
+            if res.returncode != 0:
+                print("Warning: sDAI fund step failed", file=sys.stderr)
+
+        # Optionally generate and store WALLET_KEYSTORE_PASSWORD
+        if args.write_password:
+            try:
+                target_env = Path(args.password_file or args.env_file or ".env")
+                target_env.parent.mkdir(parents=True, exist_ok=True)
+                content = ""
+                if target_env.exists():
+                    content = target_env.read_text()
+                exists = "WALLET_KEYSTORE_PASSWORD" in content
+                if exists and not args.overwrite_password:
+                    print(f"WALLET_KEYSTORE_PASSWORD already present in {target_env}; skipping (use --overwrite-password to replace)")
+                else:
+                    # Generate a reasonably strong URL-safe password
+                    pwd = secrets.token_urlsafe(32)
+                    lines = [] if not content else content.splitlines()
+                    # Remove any existing lines for WALLET_KEYSTORE_PASSWORD if overwriting
+                    if exists:
+                        lines = [ln for ln in lines if not ln.strip().startswith("WALLET_KEYSTORE_PASSWORD=")]
+                    lines.append(f"WALLET_KEYSTORE_PASSWORD={pwd}")
+                    target_env.write_text("\n".join(lines) + "\n")
+                    print(f"Wrote WALLET_KEYSTORE_PASSWORD to {target_env}")
+            except Exception as e:
+                print(f"Warning: failed to write WALLET_KEYSTORE_PASSWORD: {e}", file=sys.stderr)
+
+        return 0
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+def _add_kdf_args(p: argparse.ArgumentParser) -> None:
+    # Choices mirror keystore.KDF_CHOICES; kept literal so building the parser stays import-light
+    p.add_argument("--kdf", choices=["scrypt", "pbkdf2"], help="Keystore KDF (default scrypt; pbkdf2 decrypts much faster)")
+    p.add_argument("--kdf-iters", dest="kdf_iters", type=int, help="KDF work factor: scrypt n or pbkdf2 c (default 262144 for both)")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Setup CLI (phase 1: keystore)")
     sub = parser.add_subparsers(dest="cmd")
@@ -162,6 +807,7 @@ def build_parser() -> argparse.ArgumentParser:
     p_create.add_argument("--emit-env", action="store_true", help="Also write a plaintext .env.<address> with PRIVATE_KEY (insecure)")
     p_create.add_argument("--show-private-key", action="store_true", help="Print the private key (requires --insecure-plain)")
     p_create.add_argument("--insecure-plain", action="store_true", help="Acknowledge insecurity when writing/printing plaintext keys")
+    _add_kdf_args(p_create)
     p_create.set_defaults(func=cmd_keystore_create)
 
     # keystore-decrypt
@@ -188,36 +834,7 @@ def build_parser() -> argparse.ArgumentParser:
     p_hd.add_argument("--emit-env", action="store_true", help="Also write a plaintext .env.<address> (insecure)")
     p_hd.add_argument("--show-private-key", action="store_true", help="Print the derived private key (requires --insecure-plain)")
     p_hd.add_argument("--insecure-plain", action="store_true", help="Acknowledge insecurity when writing/printing plaintext keys")
-    def _cmd_hd(args: argparse.Namespace) -> int:
-        try:
-            if args.env_file:
-                load_dotenv(args.env_file)
-            mnemonic = args.mnemonic or os.getenv(args.mnemonic_env)  # type: ignore[arg-type]
-            if not mnemonic:
-                print("Mnemonic not provided (use --mnemonic or --mnemonic-env)", file=sys.stderr)
-                return 2
-            priv_hex, address = derive_privkey_from_mnemonic(mnemonic.strip(), args.path)
-            password = resolve_password(args.keystore_pass, args.keystore_pass_env, "PRIVATE_KEY")
-            keystore, _ = encrypt_private_key(priv_hex, password)
-            out_dir = Path(args.out or "build/wallets")
-            ks_path = write_keystore(out_dir, address, keystore)
-            print(f"Derived {address} at {args.path}")
-            print(f"Created keystore: {ks_path}")
-            if args.emit_env:
-                if not args.insecure_plain:
-                    print("Refusing to write plaintext env without --insecure-plain", file=sys.stderr)
-                    return 2
-                env_path = write_env_private_key(out_dir, address, priv_hex)
-                print(f"Wrote plaintext env (insecure): {env_path}")
-            if args.show_private_key:
-                if not args.insecure_plain:
-                    print("Refusing to print private key without --insecure-plain", file=sys.stderr)
-                    return 2
-                print(f"Private key: {priv_hex}")
-            return 0
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
+    _add_kdf_args(p_hd)
     p_hd.set_defaults(func=_cmd_hd)
 
     # hd-new: generate a fresh mnemonic + ephemeral password in-memory; derive N accounts and write keystores
@@ -230,56 +847,7 @@ def build_parser() -> argparse.ArgumentParser:
     p_new.add_argument("--write-seed-env", action="store_true", help="Write MNEMONIC and WALLET_KEYSTORE_PASSWORD to an env file")
     p_new.add_argument("--seed-env-file", help="Target env file path (default .env.seed)")
     p_new.add_argument("--overwrite-seed-env", action="store_true", help="Overwrite seed env file if it already exists")
-    def _cmd_hd_new(args: argparse.Namespace) -> int:
-        try:
-            # Enable HD features and generate mnemonic
-            Account.enable_unaudited_hdwallet_features()
-            acct, mnemonic = Account.create_with_mnemonic()
-
-            # Resolve password: provided or generate ephemeral
-            if args.keystore_pass:
-                password = args.keystore_pass
-            else:
-                # Generate a reasonably strong URL-safe password
-                password = secrets.token_urlsafe(24)
-
-            out_dir = Path(args.out or "build/wallets")
-
-            print("Deriving accounts:")
-            derived = []
-            for i in range(int(args.count)):
-                path = f"{args.path_base}/{i}"
-                priv_hex, address = derive_privkey_from_mnemonic(mnemonic, path)
-                keystore, _ = encrypt_private_key(priv_hex, password)
-                ks_path = write_keystore(out_dir, address, keystore)
-                derived.append({"index": i, "path": path, "address": address, "keystore": str(ks_path)})
-                print(f"  [{i}] {address} @ {path} -> {ks_path}")
-
-            if args.print_secrets or not args.keystore_pass:
-                print("\nSECRETS (Handle carefully; not stored anywhere):")
-                print(f"Mnemonic: {mnemonic}")
-                print(f"Keystore password: {password}")
-
-            # Optionally write seed env for future runs
-            if args.write_seed_env:
-                try:
-                    target = Path(args.seed_env_file or ".env.seed")
-                    if target.exists() and not args.overwrite_seed_env:
-                        print(f"Seed env file already exists at {target}; skipping write (use --overwrite-seed-env to replace)")
-                    else:
-                        target.parent.mkdir(parents=True, exist_ok=True)
-                        with open(target, "w") as f:
-                            f.write(f"MNEMONIC='{mnemonic}'\n")
-                            f.write(f"WALLET_KEYSTORE_PASSWORD={password}\n")
-                            f.write(f"HD_PATH_BASE=\"{args.path_base}\"\n")
-                        print(f"Wrote seed env to {target}")
-                except Exception as e:
-                    print(f"Warning: failed to write seed env: {e}", file=sys.stderr)
-
-            return 0
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
+    _add_kdf_args(p_new)
     p_new.set_defaults(func=_cmd_hd_new)
 
     # hd-from-env: read PRIVATE_KEY from --env-file, generate mnemonic, derive batch, and write an .env with MNEMONIC + WALLET_KEYSTORE_PASSWORD
@@ -290,47 +858,6 @@ def build_parser() -> argparse.ArgumentParser:
     p_hfe.add_argument("--path-base", default="m/44'/60'/0'/0", help="Base derivation path (default m/44'/60'/0'/0)")
     p_hfe.add_argument("--out", help="Output directory for keystore files (default build/wallets)")
     p_hfe.add_argument("--print-secrets", action="store_true", help="Also print the generated mnemonic and password")
-    def _cmd_hd_from_env(args: argparse.Namespace) -> int:
-        try:
-            # Load source env to get PRIVATE_KEY
-            load_dotenv(args.env_file)
-            pk = os.getenv("PRIVATE_KEY")
-            if not pk:
-                print("PRIVATE_KEY not found in --env-file", file=sys.stderr)
-                return 2
-            # Derive keystore password deterministically from PRIVATE_KEY
-            password = resolve_password(None, None, "PRIVATE_KEY")
-
-            # Create mnemonic and derive batch
-            Account.enable_unaudited_hdwallet_features()
-            acct, mnemonic = Account.create_with_mnemonic()
-
-            out_dir = Path(args.out or "build/wallets")
-            base = args.path_base
-            print("Deriving accounts:")
-            for i in range(int(args.count)):
-                path = f"{base}/{i}"
-                priv_hex, address = derive_privkey_from_mnemonic(mnemonic, path)
-                keystore, _ = encrypt_private_key(priv_hex, password)
-                ks_path = write_keystore(out_dir, address, keystore)
-                print(f"  [{i}] {address} @ {path} -> {ks_path}")
-
-            # Write out .env with MNEMONIC and WALLET_KEYSTORE_PASSWORD for future runs
-            out_env = Path(args.out_env)
-            out_env.parent.mkdir(parents=True, exist_ok=True)
-            with open(out_env, "w") as f:
-                f.write(f"MNEMONIC='{mnemonic}'\n")
-                f.write(f"WALLET_KEYSTORE_PASSWORD={password}\n")
-                f.write(f"HD_PATH_BASE=\"{base}\"\n")
-            print(f"Wrote seed env: {out_env}")
-            if args.print_secrets:
-                print("\nSECRETS (Copied to out-env):")
-                print(f"Mnemonic: {mnemonic}")
-                print(f"Keystore password: {password}")
-            return 0
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
     p_hfe.set_defaults(func=_cmd_hd_from_env)
 
     # generate: batch create wallets (hd|random) and update index
@@ -349,66 +876,12 @@ def build_parser() -> argparse.ArgumentParser:
     p_gen.add_argument("--emit-env", action="store_true", help="Also write plaintext .env.<address> (insecure)")
     p_gen.add_argument("--insecure-plain", action="store_true", help="Acknowledge insecurity when writing plaintext env files")
     p_gen.add_argument("--env-file", help="Path to .env file for resolving env vars (mnemonic/password)")
+    p_gen.add_argument("--disable-pool", action="store_true", help="Encrypt keystores serially instead of in a process pool")
     # Password generation and persistence
     p_gen.add_argument("--generate-password", action="store_true", help="Generate a random WALLET_KEYSTORE_PASSWORD for this run (overrides --keystore-pass/env)")
     p_gen.add_argument("--write-password", action="store_true", help="Write WALLET_KEYSTORE_PASSWORD to env file at end")
     p_gen.add_argument("--password-file", help="Target env file path (default: --env-file or .env)")
     p_gen.add_argument("--overwrite-password", action="store_true", help="Overwrite WALLET_KEYSTORE_PASSWORD if it already exists in the target env file")
-    def _cmd_generate(args: argparse.Namespace) -> int:
-        try:
-            if args.env_file:
-                load_dotenv(args.env_file)
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index or (out_dir / "index.json"))
-            # Resolve or generate password
-            if args.generate_password:
-                password = secrets.token_urlsafe(32)
-            else:
-                # Fallback to PRIVATE_KEY-derived if no WALLET_KEYSTORE_PASSWORD
-                password = resolve_password(args.keystore_pass, args.keystore_pass_env, "PRIVATE_KEY")
-            # Create records
-            if args.mode == "hd":
-                # Resolve mnemonic from CLI or env (.env provides MNEMONIC)
-                mnemonic = args.mnemonic or (os.getenv(args.mnemonic_env) if args.mnemonic_env else None) or os.getenv("MNEMONIC")
-                if not mnemonic:
-                    print("HD mode requires MNEMONIC in --env-file or via --mnemonic/--mnemonic-env", file=sys.stderr)
-                    return 2
-                # Resolve base derivation path from env if provided
-                path_base = os.getenv("HD_PATH_BASE") or args.path_base
-                new_records = derive_hd_batch(mnemonic.strip(), path_base, args.start, args.count, password, out_dir, tags=args.tag or [], emit_env=args.emit_env, insecure_plain=args.insecure_plain)
-            else:
-                new_records = create_random_wallets(args.count, password, out_dir, tags=args.tag or [], emit_env=args.emit_env, insecure_plain=args.insecure_plain)
-
-            # Update index
-            existing = load_index(index_path)
-            for rec in new_records:
-                existing = upsert_record(existing, rec)
-            save_index(index_path, existing)
-
-            print(f"Generated {len(new_records)} wallet(s). Index: {index_path}")
-            for r in new_records:
-                print(f" - {r['address']} -> {r['keystore_path']}" + (f" @ {r.get('path')}" if r.get('path') else ""))
-
-            # Optionally write the keystore password to an env file
-            if args.write_password:
-                try:
-                    target_env = Path(args.password_file or args.env_file or ".env")
-                    target_env.parent.mkdir(parents=True, exist_ok=True)
-                    existing_text = target_env.read_text() if target_env.exists() else ""
-                    exists = any(line.strip().startswith("WALLET_KEYSTORE_PASSWORD=") for line in existing_text.splitlines())
-                    if exists and not args.overwrite_password:
-                        print(f"WALLET_KEYSTORE_PASSWORD already present in {target_env}; skipping (use --overwrite-password to replace)")
-                    else:
-                        lines = [] if not existing_text else [ln for ln in existing_text.splitlines() if not ln.strip().startswith("WALLET_KEYSTORE_PASSWORD=")]
-                        lines.append(f"WALLET_KEYSTORE_PASSWORD={password}")
-                        target_env.write_text("\n".join(lines) + "\n")
-                        print(f"Wrote WALLET_KEYSTORE_PASSWORD to {target_env}")
-                except Exception as e:
-                    print(f"Warning: failed to write WALLET_KEYSTORE_PASSWORD: {e}", file=sys.stderr)
-            return 0
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
     p_gen.set_defaults(func=_cmd_generate)
 
     # list: show wallets from index or keystore directory
@@ -416,26 +889,6 @@ def build_parser() -> argparse.ArgumentParser:
     p_list.add_argument("--out", help="Keystore directory (default build/wallets)")
     p_list.add_argument("--index", help="Index file (default build/wallets/index.json)")
     p_list.add_argument("--format", choices=["table", "json"], default="table")
-    def _cmd_list(args: argparse.Namespace) -> int:
-        try:
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index or (out_dir / "index.json"))
-            records = load_index(index_path)
-            if not records:
-                # fallback: scan
-                records = scan_keystores(out_dir)
-            if args.format == "json":
-                print(json.dumps({"wallets": records}, indent=2))
-            else:
-                for r in records:
-                    addr = r.get("address")
-                    path = r.get("path", "-")
-                    tags = ",".join(r.get("tags", [])) or "-"
-                    print(f"{addr} | {path} | {tags} | {r.get('keystore_path')}")
-            return 0
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
     p_list.set_defaults(func=_cmd_list)
 
     # import-keys: import from file or repeated --key
@@ -451,36 +904,7 @@ def build_parser() -> argparse.ArgumentParser:
     p_imp.add_argument("--emit-env", action="store_true", help="Also write plaintext .env.<address> (insecure)")
     p_imp.add_argument("--insecure-plain", action="store_true", help="Acknowledge insecurity when writing plaintext env files")
     p_imp.add_argument("--env-file", help="Path to .env file for resolving env vars (password)")
-    def _cmd_import(args: argparse.Namespace) -> int:
-        try:
-            if args.env_file:
-                load_dotenv(args.env_file)
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index or (out_dir / "index.json"))
-            password = resolve_password(args.keystore_pass, args.keystore_pass_env)
-            keys: List[str] = []
-            if args.file:
-                with open(args.file, "r") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith("#"):
-                            keys.append(line)
-            else:
-                keys = args.key or []
-            new_records = import_private_keys(keys, password, out_dir, tags=args.tag or [], emit_env=args.emit_env, insecure_plain=args.insecure_plain)
-            existing = load_index(index_path)
-            # simple merge avoiding duplicates
-            seen = {r.get('address') for r in existing}
-            for r in new_records:
-                if r['address'] not in seen:
-                    existing.append(r)
-                    seen.add(r['address'])
-            save_index(index_path, existing)
-            print(f"Imported {len(new_records)} key(s). Index: {index_path}")
-            return 0
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
+    p_imp.add_argument("--disable-pool", action="store_true", help="Encrypt keystores serially instead of in a process pool")
     p_imp.set_defaults(func=_cmd_import)
 
     # fund-xdai: top up native xDAI to a target balance for each wallet in index/keystore dir
@@ -512,49 +936,6 @@ def build_parser() -> argparse.ArgumentParser:
     p_fx.add_argument("--dry-run", action="store_true", help="Do not send transactions; write plan JSON only")
     p_fx.add_argument("--confirm", action="store_true", help="Confirm execution; without this flag, a plan is written and no txs are sent")
     p_fx.add_argument("--log", help="Path to write JSON log (default build/wallets/funding_<timestamp>.json)")
-    def _cmd_fund_xdai(args: argparse.Namespace) -> int:
-        try:
-            from decimal import Decimal
-
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index) if args.index else (out_dir / "index.json")
-            # Gas config
-            if args.legacy:
-                gas = _GasConfig(type="legacy", gas_limit=int(args.gas_limit), gas_price_gwei=Decimal(str(args.gas_price_gwei)))
-            else:
-                gas = _GasConfig(
-                    type="eip1559",
-                    gas_limit=int(args.gas_limit),
-                    max_fee_gwei=Decimal(str(args.max_fee_gwei)),
-                    prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
-                )
-            log_path = Path(args.log) if args.log else None
-            rc = _fund_xdai(
-                out_dir=out_dir,
-                index_path=index_path,
-                amount_eth=str(args.amount),
-                from_env=args.from_env,
-                env_file=args.env_file,
-                rpc_url=args.rpc_url,
-                chain_id=int(args.chain_id),
-                only=args.only,
-                only_path=args.only_path,
-                ensure_paths=args.ensure_path,
-                ensure_mnemonic=args.mnemonic,
-                ensure_mnemonic_env=args.mnemonic_env,
-                keystore_pass=args.keystore_pass,
-                keystore_pass_env=args.keystore_pass_env,
-                always_send=bool(args.always),
-                gas=gas,
-                timeout=int(args.timeout),
-                dry_run=bool(args.dry_run),
-                log_path=log_path,
-                require_confirm=not bool(args.confirm),
-            )
-            return int(rc)
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
     p_fx.set_defaults(func=_cmd_fund_xdai)
 
     # fund-sdai: top up ERC20 (sDAI) to a target balance per wallet
@@ -585,52 +966,12 @@ def build_parser() -> argparse.ArgumentParser:
     p_fe.add_argument("--dry-run", action="store_true", help="Do not send transactions; write plan JSON only")
     p_fe.add_argument("--confirm", action="store_true", help="Confirm execution; without this flag, a plan is written and no txs are sent")
     p_fe.add_argument("--log", help="Path to write JSON log (default build/wallets/funding_<timestamp>.json)")
-    def _cmd_fund_sdai(args: argparse.Namespace) -> int:
-        try:
-            from decimal import Decimal
-
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index) if args.index else (out_dir / "index.json")
-            # Token resolution
-            token = args.token or os.getenv("SDAI_TOKEN_ADDRESS")
-            # Gas config
-            if args.legacy:
-                gas = _GasConfig20(type="legacy", gas_limit=int(args.gas_limit), gas_price_gwei=Decimal(str(args.gas_price_gwei)))
-            else:
-                gas = _GasConfig20(
-                    type="eip1559",
-                    gas_limit=int(args.gas_limit),
-                    max_fee_gwei=Decimal(str(args.max_fee_gwei)),
-                    prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
-                )
-            log_path = Path(args.log) if args.log else None
-            rc = _fund_erc20(
-                token=token,
-                out_dir=out_dir,
-                index_path=index_path,
-                amount_token=str(args.amount),
-                from_env=args.from_env,
-                env_file=args.env_file,
-                rpc_url=args.rpc_url,
-                chain_id=int(args.chain_id),
-                only=args.only,
-                only_path=args.only_path,
-                ensure_paths=args.ensure_path,
-                ensure_mnemonic=args.mnemonic,
-                ensure_mnemonic_env=args.mnemonic_env,
-                keystore_pass=args.keystore_pass,
-                keystore_pass_env=args.keystore_pass_env,
-                always_send=bool(args.always),
-                gas=gas,
-                timeout=int(args.timeout),
-                dry_run=bool(args.dry_run),
-                log_path=log_path,
-                require_confirm=not bool(args.confirm),
-            )
-            return int(rc)
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
+    p_fe.add_argument(
+        "--reuse-log-secs",
+        type=int,
+        default=None,
+        help="Trust balances recorded in funding logs younger than N seconds; wallets already at target are not re-queried",
+    )
     p_fe.set_defaults(func=_cmd_fund_sdai)
 
     # fund-all: ensure paths (optional) and fund both xDAI and sDAI
@@ -667,84 +1008,6 @@ def build_parser() -> argparse.ArgumentParser:
     p_fa.add_argument("--timeout", type=int, default=120, help="Wait timeout (seconds) for each receipt (default 120)")
     p_fa.add_argument("--dry-run", action="store_true", help="Do not send transactions; write plan JSON only")
     p_fa.add_argument("--confirm", action="store_true", help="Confirm execution; without this flag, plans are written and no txs are sent")
-    def _cmd_fund_all(args: argparse.Namespace) -> int:
-        try:
-            from decimal import Decimal
-
-            if not args.xdai and not args.sdai:
-                print("Provide at least one of --xdai or --sdai", file=sys.stderr)
-                return 2
-
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index) if args.index else (out_dir / "index.json")
-
-            # Gas configs
-            xdai_gas = (_GasConfig(type="legacy", gas_limit=int(args.xdai_gas_limit), gas_price_gwei=Decimal(str(args.xdai_gas_price_gwei)))
-                        if args.xdai_legacy else
-                        _GasConfig(type="eip1559", gas_limit=int(args.xdai_gas_limit), max_fee_gwei=Decimal(str(args.xdai_max_fee_gwei)), prio_fee_gwei=Decimal(str(args.xdai_priority_fee_gwei))))
-
-            sdai_gas = (_GasConfig20(type="legacy", gas_limit=int(args.sdai_gas_limit), gas_price_gwei=Decimal(str(args.sdai_gas_price_gwei)))
-                        if args.sdai_legacy else
-                        _GasConfig20(type="eip1559", gas_limit=int(args.sdai_gas_limit), max_fee_gwei=Decimal(str(args.sdai_max_fee_gwei)), prio_fee_gwei=Decimal(str(args.sdai_priority_fee_gwei))))
-
-            # Execute requested legs
-            overall_rc = 0
-            if args.xdai:
-                rc_x = _fund_xdai(
-                    out_dir=out_dir,
-                    index_path=index_path,
-                    amount_eth=str(args.xdai),
-                    from_env=args.from_env,
-                    env_file=args.env_file,
-                    rpc_url=args.rpc_url,
-                    chain_id=int(args.chain_id),
-                    only=args.only,
-                    only_path=args.only_path,
-                    ensure_paths=args.ensure_path,
-                    ensure_mnemonic=args.mnemonic,
-                    ensure_mnemonic_env=args.mnemonic_env,
-                    keystore_pass=args.keystore_pass,
-                    keystore_pass_env=args.keystore_pass_env,
-                    always_send=bool(args.always),
-                    gas=xdai_gas,
-                    timeout=int(args.timeout),
-                    dry_run=bool(args.dry_run),
-                    log_path=None,
-                    require_confirm=not bool(args.confirm),
-                )
-                overall_rc = max(overall_rc, int(rc_x))
-
-            if args.sdai:
-                token = args.token or os.getenv("SDAI_TOKEN_ADDRESS")
-                rc_s = _fund_erc20(
-                    token=token,
-                    out_dir=out_dir,
-                    index_path=index_path,
-                    amount_token=str(args.sdai),
-                    from_env=args.from_env,
-                    env_file=args.env_file,
-                    rpc_url=args.rpc_url,
-                    chain_id=int(args.chain_id),
-                    only=args.only,
-                    only_path=args.only_path,
-                    ensure_paths=args.ensure_path,
-                    ensure_mnemonic=args.mnemonic,
-                    ensure_mnemonic_env=args.mnemonic_env,
-                    keystore_pass=args.keystore_pass,
-                    keystore_pass_env=args.keystore_pass_env,
-                    always_send=bool(args.always),
-                    gas=sdai_gas,
-                    timeout=int(args.timeout),
-                    dry_run=bool(args.dry_run),
-                    log_path=None,
-                    require_confirm=not bool(args.confirm),
-                )
-                overall_rc = max(overall_rc, int(rc_s))
-
-            return int(overall_rc)
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
     p_fa.set_defaults(func=_cmd_fund_all)
 
     # deploy-v5: deploy FutarchyArbExecutorV5 from an HD path owner
@@ -775,54 +1038,6 @@ def build_parser() -> argparse.ArgumentParser:
     p_dv5.add_argument("--dry-run", action="store_true", help="Do not send transactions; write plan JSON only")
     p_dv5.add_argument("--confirm", action="store_true", help="Confirm execution; without this flag, a plan is written and no txs are sent")
     p_dv5.add_argument("--log", help="Path to write JSON log (default build/wallets/deploy_v5_<timestamp>.json)")
-    def _cmd_deploy_v5(args: argparse.Namespace) -> int:
-        try:
-            from decimal import Decimal
-
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index) if args.index else (out_dir / "index.json")
-
-            # Gas config
-            if args.legacy:
-                gas = _DeployGasConfig(
-                    type="legacy",
-                    gas_limit=int(args.gas_limit),
-                    gas_price_gwei=Decimal(str(args.gas_price_gwei)),
-                )
-            else:
-                gas = _DeployGasConfig(
-                    type="eip1559",
-                    gas_limit=int(args.gas_limit),
-                    max_fee_gwei=Decimal(str(args.max_fee_gwei)),
-                    prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
-                )
-
-            log_path = Path(args.log) if args.log else None
-
-            rc = _deploy_v5(
-                path=args.path,
-                out_dir=out_dir,
-                index_path=index_path,
-                ensure_path=bool(args.ensure_path),
-                ensure_mnemonic=args.mnemonic,
-                ensure_mnemonic_env=args.mnemonic_env,
-                keystore_pass=args.keystore_pass,
-                keystore_pass_env=args.keystore_pass_env,
-                env_file=args.env_file,
-                rpc_url=args.rpc_url,
-                chain_id=int(args.chain_id),
-                gas=gas,
-                timeout=int(args.timeout),
-                dry_run=bool(args.dry_run),
-                log_path=log_path,
-                require_confirm=not bool(args.confirm),
-                fund_xdai_eth=(str(args.fund_xdai) if args.fund_xdai else None),
-                funder_env=args.funder_env,
-            )
-            return int(rc)
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
     p_dv5.set_defaults(func=_cmd_deploy_v5)
 
     # deploy-v5-linked: ensure path, pre-fund deployer (xDAI), deploy, and print path→address link
@@ -858,104 +1073,6 @@ def build_parser() -> argparse.ArgumentParser:
     p_dv5l.add_argument("--write-password", action="store_true", help="Generate a random WALLET_KEYSTORE_PASSWORD and append to the env file (or .env if not provided)")
     p_dv5l.add_argument("--password-file", help="Target env file to write WALLET_KEYSTORE_PASSWORD (default: --env-file or .env)")
     p_dv5l.add_argument("--overwrite-password", action="store_true", help="Overwrite WALLET_KEYSTORE_PASSWORD if it already exists in the target env file")
-    def _cmd_deploy_v5_linked(args: argparse.Namespace) -> int:
-        try:
-            from decimal import Decimal
-            import subprocess, json as _json
-
-            out_dir = Path(args.out or "build/wallets")
-            index_path = Path(args.index) if args.index else (out_dir / "index.json")
-
-            # Gas config
-            if args.legacy:
-                gas = _DeployGasConfig(
-                    type="legacy",
-                    gas_limit=int(args.gas_limit),
-                    gas_price_gwei=Decimal(str(args.gas_price_gwei)),
-                )
-            else:
-                gas = _DeployGasConfig(
-                    type="eip1559",
-                    gas_limit=int(args.gas_limit),
-                    max_fee_gwei=Decimal(str(args.max_fee_gwei)),
-                    prio_fee_gwei=Decimal(str(args.priority_fee_gwei)),
-                )
-
-            log_path = Path(args.log) if args.log else None
-
-            # Execute deploy with pre-fund option (xDAI). Deploy function itself funds before sending tx.
-            rc = _deploy_v5(
-                path=args.path,
-                out_dir=out_dir,
-                index_path=index_path,
-                ensure_path=bool(args.ensure_path),
-                ensure_mnemonic=args.mnemonic,
-                ensure_mnemonic_env=args.mnemonic_env,
-                keystore_pass=args.keystore_pass,
-                keystore_pass_env=args.keystore_pass_env,
-                env_file=args.env_file,
-                rpc_url=args.rpc_url,
-                chain_id=int(args.chain_id),
-                gas=gas,
-                timeout=int(args.timeout),
-                dry_run=bool(args.dry_run),
-                log_path=log_path,
-                require_confirm=not bool(args.confirm),
-                fund_xdai_eth=(str(args.fund_xdai) if args.fund_xdai else None),
-                funder_env=args.funder_env,
-            )
-            if int(rc) != 0:
-                return int(rc)
-
-            # Resolve deployed address from logs by path
-            link = _find_deploy_link_by_path(args.path)
-            if not link:
-                print("Warning: could not resolve deployed address from logs; ensure logs exist and include address.", file=sys.stderr)
-                return 0
-            print(_json.dumps({"path": link.path, "address": link.address, "deployer": link.deployer, "tx": link.tx}, indent=2))
-
-            # Optionally fund sDAI to the executor contract after deployment
-            if args.fund_sdai:
-                cmd = [
-                    sys.executable, "-m", "src.arbitrage_commands.fund_executor",
-                    "--amount", str(args.fund_sdai),
-                    "--address", link.address,
-                ]
-                if args.env_file:
-                    cmd.extend(["--env", args.env_file])
-                print(f"Funding executor with sDAI: {' '.join(cmd)}")
-                res = subprocess.run(cmd, text=True)
-                if res.returncode != 0:
-                    print("Warning: sDAI fund step failed", file=sys.stderr)
-
-            # Optionally generate and store WALLET_KEYSTORE_PASSWORD
-            if args.write_password:
-                try:
-                    target_env = Path(args.password_file or args.env_file or ".env")
-                    target_env.parent.mkdir(parents=True, exist_ok=True)
-                    content = ""
-                    if target_env.exists():
-                        content = target_env.read_text()
-                    exists = "WALLET_KEYSTORE_PASSWORD" in content
-                    if exists and not args.overwrite_password:
-                        print(f"WALLET_KEYSTORE_PASSWORD already present in {target_env}; skipping (use --overwrite-password to replace)")
-                    else:
-                        # Generate a reasonably strong URL-safe password
-                        pwd = secrets.token_urlsafe(32)
-                        lines = [] if not content else content.splitlines()
-                        # Remove any existing lines for WALLET_KEYSTORE_PASSWORD if overwriting
-                        if exists:
-                            lines = [ln for ln in lines if not ln.strip().startswith("WALLET_KEYSTORE_PASSWORD=")]
-                        lines.append(f"WALLET_KEYSTORE_PASSWORD={pwd}")
-                        target_env.write_text("\n".join(lines) + "\n")
-                        print(f"Wrote WALLET_KEYSTORE_PASSWORD to {target_env}")
-                except Exception as e:
-                    print(f"Warning: failed to write WALLET_KEYSTORE_PASSWORD: {e}", file=sys.stderr)
-
-            return 0
-        except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return 1
     p_dv5l.set_defaults(func=_cmd_deploy_v5_linked)
 
     return parser
@@ -964,6 +1081,10 @@ def build_parser() -> argparse.ArgumentParser:
 def main(argv: Optional[list[str]] = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    n = getattr(args, "kdf_iters", None)
+    if n is not None and getattr(args, "kdf", None) != "pbkdf2" and (n <= 0 or n & (n - 1)):
+        # Fail before any derivation work; pycryptodome would only say "N must be a power of 2"
+        parser.error(f"--kdf-iters for scrypt must be a power of two (e.g. {1 << max(n, 1).bit_length()}), got {n}")
     if not hasattr(args, "func"):
         parser.print_help()
         return 2
@@ -14,16 +14,22 @@ Environment Variables Required:
     - GNOSISSCAN_API_KEY: (Optional) For contract verification
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import json
+import hashlib
+import tempfile
 import argparse
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from pathlib import Path
-from decimal import Decimal
-from web3 import Web3
-from eth_account import Account
-from solcx import compile_source, install_solc
+
+# web3 / eth-account / solcx are imported where they are used so that `--help`
+# and cached compiles don't pay for them.
+if TYPE_CHECKING:
+    from web3 import Web3
+    from eth_account import Account
 
 
 # --------------------------------------------------------------------------- #
@@ -37,6 +43,13 @@ SOLIDITY_VERSION = "0.8.17"
 # Using Minimal version to avoid 0xEF opcodes
 CONTRACT_PATH = Path("contracts/FutarchyBatchExecutorMinimal.sol")
 
+# On-disk cache of compiled artifacts, keyed by source + compiler settings
+COMPILE_CACHE_DIR = Path("build/solc-cache")
+OPTIMIZE_RUNS = 200
+
+# Set once solcx is known to have SOLIDITY_VERSION installed
+_solc_ready = False
+
 # Deployment gas settings
 DEPLOYMENT_GAS_LIMIT = 3_000_000
 PRIORITY_FEE_GWEI = 2
@@ -46,23 +59,56 @@ PRIORITY_FEE_GWEI = 2
 # Contract Compilation                                                        #
 # --------------------------------------------------------------------------- #
 
+def _compile_cache_path(src_bytes: bytes, solc_version: str) -> Path:
+    """Return the cache file for a given contract source and compiler version."""
+    key = hashlib.sha256(src_bytes + f"|{solc_version}|runs={OPTIMIZE_RUNS}".encode()).hexdigest()
+    return COMPILE_CACHE_DIR / f"{key}.json"
+
+
+def _ensure_solc() -> None:
+    """Install SOLIDITY_VERSION unless solcx already has it (checked once per process)."""
+    global _solc_ready
+    if _solc_ready:
+        return
+    from solcx import get_installed_solc_versions, install_solc
+    
+    if SOLIDITY_VERSION not in {str(v) for v in get_installed_solc_versions()}:
+        try:
+            install_solc(SOLIDITY_VERSION)
+        except Exception as e:
+            print(f"⚠️  Failed to install Solidity {SOLIDITY_VERSION}: {e}")
+            return
+    _solc_ready = True
+
+
 def compile_contract() -> Dict[str, Any]:
-    """Compile the FutarchyBatchExecutor contract."""
+    """Compile the FutarchyBatchExecutor contract (cached on source hash + solc version)."""
     print("📦 Compiling FutarchyBatchExecutor contract...")
     
-    # Install Solidity compiler if needed
-    try:
-        install_solc(SOLIDITY_VERSION)
-    except Exception as e:
-        print(f"⚠️  Solidity {SOLIDITY_VERSION} already installed or error: {e}")
-    
     # Read contract source
     if not CONTRACT_PATH.exists():
         print(f"❌ Contract file not found: {CONTRACT_PATH}")
         sys.exit(1)
     
-    with open(CONTRACT_PATH, 'r') as f:
-        contract_source = f.read()
+    src_bytes = CONTRACT_PATH.read_bytes()
+    cache_path = _compile_cache_path(src_bytes, SOLIDITY_VERSION)
+    try:
+        cached = json.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        cached = None
+    except (OSError, ValueError) as e:
+        # Truncated/corrupt entry (e.g. an interrupted write): recompile and overwrite it
+        print(f"⚠️  Ignoring unreadable compile cache {cache_path}: {e}")
+        cached = None
+    if isinstance(cached, dict) and cached.get('bytecode'):
+        print(f"✅ Using cached compilation: {cache_path}")
+        return cached
+    
+    from solcx import compile_source
+    
+    _ensure_solc()
+    
+    contract_source = src_bytes.decode('utf-8')
     
     # Compile contract with optimizer settings to avoid 0xEF
     compiled = compile_source(
@@ -70,19 +116,32 @@ def compile_contract() -> Dict[str, Any]:
         output_values=['abi', 'bin', 'bin-runtime'],
         solc_version=SOLIDITY_VERSION,
         optimize=True,
-        optimize_runs=200
+        optimize_runs=OPTIMIZE_RUNS
     )
     
     # Extract contract data
     contract_id = '<stdin>:FutarchyBatchExecutorMinimal'
     contract_data = compiled[contract_id]
     
-    print("✅ Contract compiled successfully")
-    return {
+    result = {
         'abi': contract_data['abi'],
         'bytecode': contract_data['bin'],
         'runtime_bytecode': contract_data['bin-runtime']
     }
+    
+    # Temp file + rename, so a crash mid-write never leaves a half-written cache entry behind
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=cache_path.stem, suffix=".tmp", dir=str(cache_path.parent))
+    try:
+        with os.fdopen(tmp_fd, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    print("✅ Contract compiled successfully")
+    return result
 
 
 # --------------------------------------------------------------------------- #
@@ -121,11 +180,42 @@ def verify_bytecode(bytecode: str) -> bool:
 # Deployment Functions                                                        #
 # --------------------------------------------------------------------------- #
 
-def estimate_deployment_cost(w3: Web3, bytecode: str, account_address: str) -> Dict[str, Any]:
-    """Estimate gas costs for deployment."""
+def fetch_chain_state(session: Any, rpc_url: str, address: str) -> Dict[str, int]:
+    """Fetch chain id, base fee, nonce and balance for `address` in one JSON-RPC batch POST."""
+    calls = [
+        ('chain_id', 'eth_chainId', []),
+        ('block', 'eth_getBlockByNumber', ['latest', False]),
+        ('nonce', 'eth_getTransactionCount', [address, 'latest']),
+        ('balance', 'eth_getBalance', [address, 'latest']),
+        ('gas_price', 'eth_gasPrice', []),
+    ]
+    payload = [{'jsonrpc': '2.0', 'id': i, 'method': m, 'params': p} for i, (_, m, p) in enumerate(calls)]
+    resp = session.post(rpc_url, json=payload, timeout=30)
+    resp.raise_for_status()
+    replies = resp.json()
+    if not isinstance(replies, list):
+        raise RuntimeError(f"RPC does not support batch requests: {replies}")
+    by_id = {r.get('id'): r for r in replies}
+    
+    state: Dict[str, Any] = {}
+    for i, (name, method, _) in enumerate(calls):
+        reply = by_id.get(i) or {}
+        if 'error' in reply or 'result' not in reply:
+            raise RuntimeError(f"{method} failed: {reply.get('error', reply)}")
+        state[name] = reply['result']
+    
+    base_fee = (state.pop('block') or {}).get('baseFeePerGas')
+    out = {k: int(v, 16) for k, v in state.items()}
+    out['base_fee'] = int(base_fee, 16) if base_fee else out['gas_price']
+    return out
+
+
+def estimate_deployment_cost(w3: Web3, bytecode: str, account_address: str, base_fee: Optional[int] = None) -> Dict[str, Any]:
+    """Estimate gas costs for deployment (queries the latest block unless base_fee is given)."""
     # Get current gas prices
-    latest_block = w3.eth.get_block('latest')
-    base_fee = latest_block.get('baseFeePerGas', w3.eth.gas_price)
+    if base_fee is None:
+        latest_block = w3.eth.get_block('latest')
+        base_fee = latest_block.get('baseFeePerGas', w3.eth.gas_price)
     max_priority_fee = w3.to_wei(PRIORITY_FEE_GWEI, 'gwei')
     max_fee = base_fee + (max_priority_fee * 2)
     
@@ -146,13 +236,34 @@ def estimate_deployment_cost(w3: Web3, bytecode: str, account_address: str) -> D
         'base_fee_gwei': w3.from_wei(base_fee, 'gwei'),
         'priority_fee_gwei': w3.from_wei(max_priority_fee, 'gwei'),
         'max_fee_gwei': w3.from_wei(max_fee, 'gwei'),
+        'base_fee_wei': base_fee,
+        'priority_fee_wei': max_priority_fee,
         'estimated_cost_wei': estimated_cost_wei,
         'estimated_cost_eth': estimated_cost_eth
     }
 
 
-def deploy_contract(w3: Web3, account: Account, contract_data: Dict[str, Any], dry_run: bool = False) -> Optional[str]:
-    """Deploy the FutarchyBatchExecutor contract."""
+def compute_create_address(sender: str, nonce: int) -> str:
+    """Address of a contract created by `sender` at `nonce`: keccak(rlp([sender, nonce]))[12:]."""
+    import rlp
+    from eth_utils import keccak, to_bytes, to_checksum_address
+    
+    return to_checksum_address(keccak(rlp.encode([to_bytes(hexstr=sender), nonce]))[-20:])
+
+
+def deploy_contract(
+    w3: Web3,
+    account: Account,
+    contract_data: Dict[str, Any],
+    dry_run: bool = False,
+    chain_state: Optional[Dict[str, int]] = None,
+) -> Optional[str]:
+    """Deploy the FutarchyBatchExecutor contract.
+    
+    chain_state (from fetch_chain_state) supplies base fee, balance, nonce and chain id
+    so they are not queried one by one.
+    """
+    chain_state = chain_state or {}
     print("\n🚀 Deploying FutarchyBatchExecutorMinimal...")
     
     # Verify bytecode before deployment
@@ -179,7 +290,7 @@ def deploy_contract(w3: Web3, account: Account, contract_data: Dict[str, Any], d
     )
     
     # Estimate deployment costs
-    costs = estimate_deployment_cost(w3, bytecode, account.address)
+    costs = estimate_deployment_cost(w3, bytecode, account.address, chain_state.get('base_fee'))
     
     print(f"\n💰 Deployment Cost Estimates:")
     print(f"   Gas Estimate: {costs['gas_estimate']:,}")
@@ -190,7 +301,7 @@ def deploy_contract(w3: Web3, account: Account, contract_data: Dict[str, Any], d
     print(f"   Estimated Cost: {costs['estimated_cost_eth']:.6f} ETH")
     
     # Check balance
-    balance = w3.eth.get_balance(account.address)
+    balance = chain_state['balance'] if 'balance' in chain_state else w3.eth.get_balance(account.address)
     balance_eth = w3.from_wei(balance, 'ether')
     print(f"\n💵 Deployer Balance: {balance_eth:.6f} ETH")
     
@@ -198,23 +309,23 @@ def deploy_contract(w3: Web3, account: Account, contract_data: Dict[str, Any], d
         print("❌ Insufficient balance for deployment!")
         return None
     
+    nonce = chain_state['nonce'] if 'nonce' in chain_state else w3.eth.get_transaction_count(account.address)
+    
     if dry_run:
         print("\n🏃 Dry run mode - skipping actual deployment")
-        # Calculate deterministic address (simplified)
-        print(f"📍 Contract will be deployed from: {account.address}")
-        contract_address = "0x" + "0" * 40  # Placeholder for dry run
+        print(f"📍 Contract will be deployed from: {account.address} (nonce {nonce})")
+        contract_address = compute_create_address(account.address, nonce)
+        print(f"📍 Expected contract address: {contract_address}")
         return contract_address
     
     # Build transaction
-    nonce = w3.eth.get_transaction_count(account.address)
-    
     tx = contract.constructor().build_transaction({
         'from': account.address,
         'nonce': nonce,
         'gas': costs['gas_limit'],
-        'maxFeePerGas': int(Decimal(str(costs['base_fee_gwei'])) * Decimal('1e9') + Decimal(str(costs['priority_fee_gwei'])) * Decimal('1e9') * 2),
-        'maxPriorityFeePerGas': int(Decimal(str(costs['priority_fee_gwei'])) * Decimal('1e9')),
-        'chainId': w3.eth.chain_id
+        'maxFeePerGas': costs['base_fee_wei'] + costs['priority_fee_wei'] * 2,
+        'maxPriorityFeePerGas': costs['priority_fee_wei'],
+        'chainId': chain_state['chain_id'] if 'chain_id' in chain_state else w3.eth.chain_id
     })
     
     # Sign and send transaction
@@ -233,7 +344,8 @@ def deploy_contract(w3: Web3, account: Account, contract_data: Dict[str, Any], d
     
     # Wait for confirmation
     print("⏳ Waiting for confirmation...")
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=300)
+    # Gnosis blocks are ~5s apart; polling every 1s (default 0.1s) still picks the receipt up promptly
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=300, poll_latency=1)
     
     if receipt['status'] == 1:
         contract_address = receipt['contractAddress']
@@ -274,23 +386,26 @@ def update_environment_file(contract_address: str) -> None:
     env_file = Path(".env.pectra")
     
     # Read existing content if file exists
-    existing_content = ""
-    if env_file.exists():
-        with open(env_file, 'r') as f:
-            existing_content = f.read()
+    try:
+        existing_content = env_file.read_text()
+    except FileNotFoundError:
+        existing_content = ""
+    
+    # Index KEY= lines once so updates are dict lookups (comments/order are preserved)
+    lines = existing_content.strip().splitlines() if existing_content else []
+    key_index = {
+        line.split('=', 1)[0]: i
+        for i, line in enumerate(lines)
+        if '=' in line and not line.startswith('#')
+    }
     
     # Update or add IMPLEMENTATION_ADDRESS
-    lines = existing_content.strip().split('\n') if existing_content else []
-    updated = False
-    
-    for i, line in enumerate(lines):
-        if line.startswith('IMPLEMENTATION_ADDRESS='):
-            lines[i] = f'IMPLEMENTATION_ADDRESS={contract_address}'
-            updated = True
-            break
-    
-    if not updated:
-        lines.append(f'IMPLEMENTATION_ADDRESS={contract_address}')
+    impl_line = f'IMPLEMENTATION_ADDRESS={contract_address}'
+    if 'IMPLEMENTATION_ADDRESS' in key_index:
+        lines[key_index['IMPLEMENTATION_ADDRESS']] = impl_line
+    else:
+        key_index['IMPLEMENTATION_ADDRESS'] = len(lines)
+        lines.append(impl_line)
     
     # Add other Pectra-specific settings if not present
     pectra_settings = {
@@ -300,16 +415,25 @@ def update_environment_file(contract_address: str) -> None:
     }
     
     for key, value in pectra_settings.items():
-        if not any(line.startswith(f'{key}=') for line in lines):
+        if key not in key_index:
+            key_index[key] = len(lines)
             lines.append(f'{key}={value}')
     
-    # Write updated content
-    with open(env_file, 'w') as f:
-        f.write('\n'.join(lines) + '\n')
+    # Write updated content in a single write
+    env_file.write_text('\n'.join(lines) + '\n')
     
     print(f"\n✅ Updated {env_file} with deployment address")
 
 
+def _dumps_indented(data: Any) -> bytes:
+    """JSON-encode with 2-space indent, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(data, indent=2).encode()
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+
 # --------------------------------------------------------------------------- #
 # Main Deployment Flow                                                        #
 # --------------------------------------------------------------------------- #
@@ -321,6 +445,9 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Perform dry run without actual deployment')
     args = parser.parse_args()
     
+    from web3 import Web3
+    from eth_account import Account
+    
     print("🏗️  FutarchyBatchExecutor Deployment Script")
     print("=" * 50)
     
@@ -338,46 +465,61 @@ def main():
     
     # Connect to network
     print(f"\n🌐 Connecting to RPC: {rpc_url}")
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    
-    if not w3.is_connected():
-        print("❌ Failed to connect to network")
-        sys.exit(1)
+    # One pooled keep-alive session for every RPC round trip in this run
+    import requests
+    from requests.adapters import HTTPAdapter
     
-    chain_id = w3.eth.chain_id
-    print(f"✅ Connected to chain ID: {chain_id}")
-    
-    if chain_id != 100:
-        print("⚠️  Warning: Not on Gnosis Chain (expected chain ID: 100)")
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    w3 = Web3(Web3.HTTPProvider(rpc_url, session=session, request_kwargs={'timeout': 30}))
     
     # Setup account
     account = None
     if private_key:
         account = Account.from_key(private_key)
-        print(f"👤 Deployer Address: {account.address}")
     elif args.dry_run:
         # Use dummy account for dry run
         account = Account.create()
-        print(f"👤 Dry Run Address: {account.address}")
     
     # Compile contract
     contract_data = compile_contract()
     
-    # Save ABI for reference
+    # Save ABI for reference (serialized once, written to both locations)
+    abi_bytes = _dumps_indented(contract_data['abi'])
     abi_path = Path("src/config/abis/FutarchyBatchExecutorMinimal.json")
     abi_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(abi_path, 'w') as f:
-        json.dump(contract_data['abi'], f, indent=2)
+    abi_path.write_bytes(abi_bytes)
     print(f"💾 Saved ABI to {abi_path}")
     
     # Also save as the main executor ABI for compatibility
     compat_path = Path("src/config/abis/FutarchyBatchExecutor.json")
-    with open(compat_path, 'w') as f:
-        json.dump(contract_data['abi'], f, indent=2)
+    compat_path.write_bytes(abi_bytes)
     print(f"💾 Saved compatibility ABI to {compat_path}")
     
+    # chainId, latest block, nonce, balance and gasPrice in one batched round trip, read only
+    # after compiling so a cold solc install/compile can't leave the fee cap on a stale base fee;
+    # fall back to individual calls for RPCs that reject JSON-RPC batches
+    chain_state: Optional[Dict[str, int]] = None
+    try:
+        chain_state = fetch_chain_state(session, rpc_url, account.address)
+        chain_id = chain_state['chain_id']
+    except Exception as e:
+        print(f"⚠️  Batched RPC request failed ({e}); using individual calls")
+        if not w3.is_connected():
+            print("❌ Failed to connect to network")
+            sys.exit(1)
+        chain_id = w3.eth.chain_id
+    print(f"✅ Connected to chain ID: {chain_id}")
+    
+    if chain_id != 100:
+        print("⚠️  Warning: Not on Gnosis Chain (expected chain ID: 100)")
+    
+    print(f"👤 {'Deployer' if private_key else 'Dry Run'} Address: {account.address}")
+    
     # Deploy contract
-    contract_address = deploy_contract(w3, account, contract_data, args.dry_run)
+    contract_address = deploy_contract(w3, account, contract_data, args.dry_run, chain_state)
     
     if contract_address and not args.dry_run:
         # Update environment file
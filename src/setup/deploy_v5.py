@@ -196,8 +196,7 @@ def _derive_private_key_for_path(
     ks_json = read_keystore(Path(ks_path))
     from .keystore import decrypt_keystore
 
-    priv_hex = decrypt_keystore(ks_json, password)
-    address = to_checksum_address(Account.from_key(priv_hex).address)
+    priv_hex, address = decrypt_keystore(ks_json, password)
     # sanity check: if index has address, ensure it matches
     try:
         indexed_addr = to_checksum_address(match.get("address"))
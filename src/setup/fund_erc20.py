@@ -1,21 +1,37 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import asyncio
+import fnmatch
+import functools
 import json
 import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from decimal import Decimal, InvalidOperation, ROUND_DOWN
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
-from eth_utils import to_checksum_address
+from eth_keys import keys
+from eth_utils import keccak, to_checksum_address
 from web3 import Web3
 
 from .wallet_manager import load_index, scan_keystores, save_index, upsert_record, record_for
 from .keystore import encrypt_private_key, write_keystore, derive_privkey_from_mnemonic, resolve_password
+from .multicall import address_word, balance_of_call, decimals_call, decode_uint, rpc_batch, try_aggregate
+
+# Concurrent receipt waits (thread-pool fallback); each is an idle HTTP poll loop
+RECEIPT_WORKERS = 16
+# Gnosis blocks are ~5s apart; polling each pending receipt every second is plenty
+RECEIPT_POLL_SECONDS = 1.0
+
+# Checksumming runs keccak over the address; the same addresses recur across filters and calls
+_cs = functools.lru_cache(maxsize=4096)(to_checksum_address)
 
 
 def _utc_now_iso() -> str:
@@ -46,11 +62,29 @@ def _load_env(path: Optional[str]) -> None:
             pass
 
 
+@functools.lru_cache(maxsize=1)
+def _rpc_session():
+    """Shared keep-alive requests.Session for all RPC traffic in this run.
+
+    The pool is sized for the concurrent receipt waiters; urllib3 retries only
+    connection failures for POSTs, so a broadcast is never silently re-sent.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def _build_w3(rpc_url: Optional[str] = None) -> Web3:
     url = rpc_url or os.getenv("RPC_URL") or os.getenv("GNOSIS_RPC_URL")
     if not url:
         raise EnvironmentError("Set --rpc-url or RPC_URL/GNOSIS_RPC_URL in env")
-    w3 = Web3(Web3.HTTPProvider(url))
+    w3 = Web3(Web3.HTTPProvider(url, session=_rpc_session(), request_kwargs={"timeout": 30}))
     try:
         from web3.middleware import geth_poa_middleware
 
@@ -60,16 +94,6 @@ def _build_w3(rpc_url: Optional[str] = None) -> Web3:
     return w3
 
 
-def _to_wei(w3: Web3, value: Any, unit: str) -> int:
-    try:
-        to_wei = getattr(w3, "to_wei", None)
-        if callable(to_wei):
-            return int(to_wei(value, unit))
-        return int(Web3.toWei(value, unit))
-    except Exception:
-        return int(Web3.toWei(value, unit))
-
-
 ERC20_ABI = [
     {
         "name": "decimals",
@@ -101,8 +125,82 @@ ERC20_ABI = [
 ]
 
 
+TRANSFER_SELECTOR = keccak(text="transfer(address,uint256)")[:4]
+
+
 def _erc20(w3: Web3, token: str):
-    return w3.eth.contract(address=to_checksum_address(token), abi=ERC20_ABI)
+    return w3.eth.contract(address=_cs(token), abi=ERC20_ABI)
+
+
+def _transfer_calldata(to_word: bytes, value_units: int) -> bytes:
+    """ABI calldata for transfer(address,uint256) given the recipient's padded address word."""
+    return TRANSFER_SELECTOR + to_word + value_units.to_bytes(32, "big")
+
+
+_DYNAMIC_FEE_FIELDS = frozenset({"chainId", "nonce", "maxPriorityFeePerGas", "maxFeePerGas", "gas", "to", "value", "data"})
+
+
+def _rlp_list_header(length: int) -> bytes:
+    if length < 56:
+        return bytes([0xC0 + length])
+    len_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([0xF7 + len(len_bytes)]) + len_bytes
+
+
+def _dynamic_fee_template(
+    key: keys.PrivateKey, chain_id: int, prio_fee: int, max_fee: int, gas: int, to: str, value: int = 0
+) -> Callable[[int, bytes], bytes]:
+    """Return sign(nonce, data) -> raw EIP-1559 tx for a fixed (chain, fees, gas, to, value).
+
+    The constant fields are RLP-encoded once; each call only encodes the nonce and
+    calldata, splices them in and signs.
+    """
+    import rlp
+
+    enc = rlp.encode
+    head = enc(chain_id)
+    middle = enc(prio_fee) + enc(max_fee) + enc(gas) + enc(bytes.fromhex(to[2:])) + enc(value)
+    access_list = enc([])
+
+    def sign(nonce: int, data: bytes) -> bytes:
+        body = head + enc(nonce) + middle + enc(bytes(data)) + access_list
+        sig = key.sign_msg_hash(keccak(b"\x02" + _rlp_list_header(len(body)) + body))
+        body += enc(sig.v) + enc(sig.r) + enc(sig.s)
+        return b"\x02" + _rlp_list_header(len(body)) + body
+
+    return sign
+
+
+def _sign_dynamic_fee_tx(key: keys.PrivateKey, tx: Dict[str, Any]) -> bytes:
+    """Sign an EIP-1559 tx (empty access list) by RLP-encoding it directly; returns the raw tx bytes."""
+    template = _dynamic_fee_template(
+        key, tx["chainId"], tx["maxPriorityFeePerGas"], tx["maxFeePerGas"], tx["gas"], tx["to"], tx["value"]
+    )
+    return template(tx["nonce"], tx["data"])
+
+
+def _tx_signer(acct: LocalAccount) -> Callable[[Dict[str, Any]], bytes]:
+    """Return a function that signs a tx dict with acct's key and returns the raw tx bytes.
+
+    Account.sign_transaction rebuilds the key object from the hex key on every call; this
+    builds it once and reuses it for the whole batch. Plain EIP-1559 txs (the transfer
+    loop's shape) skip eth-account's dict validation and are RLP-encoded directly.
+    """
+    key = keys.PrivateKey(bytes(acct.key))
+    try:
+        from eth_account._utils.signing import sign_transaction_dict
+    except ImportError:
+        sign_transaction_dict = None
+
+    def sign(tx: Dict[str, Any]) -> bytes:
+        if tx.keys() == _DYNAMIC_FEE_FIELDS:
+            return _sign_dynamic_fee_tx(key, tx)
+        if sign_transaction_dict is not None:
+            return bytes(sign_transaction_dict(key, tx)[3])
+        signed = acct.sign_transaction(tx)
+        return bytes(getattr(signed, "rawTransaction", None) or signed.raw_transaction)
+
+    return sign
 
 
 def _get_decimals(w3: Web3, token: str) -> int:
@@ -112,6 +210,118 @@ def _get_decimals(w3: Web3, token: str) -> int:
         return 18
 
 
+def _funder_state(w3: Web3, funder: str) -> Tuple[int, int, int]:
+    """Return (chain id, pending nonce, native balance) for the funder in one JSON-RPC batch.
+
+    Falls back to three separate calls when the endpoint does not accept batches.
+    """
+    try:
+        chain_id, nonce, balance = rpc_batch(
+            w3,
+            [
+                ("eth_chainId", []),
+                ("eth_getTransactionCount", [funder, "pending"]),
+                ("eth_getBalance", [funder, "latest"]),
+            ],
+            session=_rpc_session(),
+        )
+        return int(chain_id, 16), int(nonce, 16), int(balance, 16)
+    except Exception:
+        return (
+            int(w3.eth.chain_id),
+            int(w3.eth.get_transaction_count(funder, "pending")),
+            int(w3.eth.get_balance(funder)),
+        )
+
+
+def _read_balances(w3: Web3, token: str, recipients: List[str], funder: str) -> Tuple[int, Dict[str, int], int]:
+    """Return (decimals, recipient balances, funder token balance).
+
+    All reads go through one Multicall3 tryAggregate; any entry that fails there (or the
+    whole batch, if Multicall3 is unavailable) is re-read with a direct call.
+    """
+    calls = [decimals_call(token)]
+    calls += [balance_of_call(token, a) for a in recipients]
+    calls.append(balance_of_call(token, funder))
+    try:
+        values = [decode_uint(res) for res in try_aggregate(w3, calls)]
+    except Exception:
+        values = [None] * len(calls)
+
+    contract = _erc20(w3, token)
+    decimals = values[0] if values[0] is not None else _get_decimals(w3, token)
+    balances: Dict[str, int] = {}
+    for addr, bal in zip(recipients, values[1:-1]):
+        balances[addr] = bal if bal is not None else int(contract.functions.balanceOf(addr).call())
+    funder_token = values[-1]
+    if funder_token is None:
+        funder_token = int(contract.functions.balanceOf(funder).call())
+    return decimals, balances, funder_token
+
+
+def _token_balances(w3: Web3, token: str, addrs: List[str]) -> Dict[str, Optional[int]]:
+    """balanceOf for each address via one multicall; falls back to direct calls, None if those fail too."""
+    if not addrs:
+        return {}
+    try:
+        values = [decode_uint(res) for res in try_aggregate(w3, [balance_of_call(token, a) for a in addrs])]
+    except Exception:
+        values = [None] * len(addrs)
+    contract = _erc20(w3, token)
+    out: Dict[str, Optional[int]] = {}
+    for addr, bal in zip(addrs, values):
+        if bal is None:
+            try:
+                bal = int(contract.functions.balanceOf(addr).call())
+            except Exception:
+                bal = None
+        out[addr] = bal
+    return out
+
+
+async def _wait_receipts_async(url: str, tx_hashes: List[Any], timeout: int) -> List[Any]:
+    import aiohttp
+    from web3 import AsyncHTTPProvider, AsyncWeb3
+
+    provider = AsyncHTTPProvider(url, request_kwargs={"timeout": 30})
+    async with aiohttp.ClientSession() as session:
+        await provider.cache_async_session(session)
+        aw3 = AsyncWeb3(provider)
+        return await asyncio.gather(
+            *(aw3.eth.wait_for_transaction_receipt(h, timeout=timeout, poll_latency=RECEIPT_POLL_SECONDS) for h in tx_hashes),
+            return_exceptions=True,
+        )
+
+
+def _wait_receipts(w3: Web3, tx_hashes: List[Any], timeout: int) -> List[Any]:
+    """Wait for all receipts concurrently; returns a receipt or the raised exception per hash, in order.
+
+    Uses one asyncio loop over AsyncWeb3 for HTTP providers, otherwise a thread pool
+    over the sync provider. The pool is also the fallback whenever the async path
+    cannot run (no aiohttp, called from inside a running event loop, AsyncWeb3 setup
+    failing): the transfers are already broadcast by then, so waiting must not raise.
+    """
+    if not tx_hashes:
+        return []
+    url = getattr(w3.provider, "endpoint_uri", None)
+    if url and str(url).startswith("http"):
+        coro = _wait_receipts_async(str(url), tx_hashes, timeout)
+        try:
+            return asyncio.run(coro)
+        except Exception:
+            # Receipt polling is read-only, so re-waiting any hashes on the pool is safe
+            coro.close()
+
+    def wait(h: Any) -> Any:
+        try:
+            return w3.eth.wait_for_transaction_receipt(h, timeout=timeout, poll_latency=RECEIPT_POLL_SECONDS)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(RECEIPT_WORKERS, len(tx_hashes))) as ex:
+        return list(ex.map(wait, tx_hashes))
+
+
 def _parse_amount_units(amount_str: str) -> Decimal:
     try:
         v = Decimal(str(amount_str))
@@ -123,8 +333,16 @@ def _parse_amount_units(amount_str: str) -> Decimal:
 
 
 def _to_base_units(amount: Decimal, decimals: int) -> int:
-    scale = Decimal(10) ** decimals
-    return int((amount * scale).to_integral_value(rounding=ROUND_DOWN))
+    """Scale amount by 10**decimals and truncate, using exact integer math.
+
+    Avoids Decimal multiplication, which rounds to the 28-digit context precision
+    for large amounts before the ROUND_DOWN quantize is even applied.
+    """
+    sign, digits, exponent = amount.as_tuple()
+    units = int("".join(map(str, digits)) or "0")
+    shift = int(exponent) + decimals
+    units = units * 10**shift if shift >= 0 else units // 10**-shift
+    return -units if sign else units
 
 
 def _default_log_path(base_dir: Path) -> Path:
@@ -132,23 +350,92 @@ def _default_log_path(base_dir: Path) -> Path:
     return base_dir / f"funding_{ts}.json"
 
 
+def _compile_globs(patterns: List[str]) -> "re.Pattern[str]":
+    """Fuse glob patterns into one regex (case-sensitive, like fnmatch on POSIX) so each record is matched in one pass."""
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+def _write_log(path: Path, summary: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+    """Write {"summary", "results"} to path, one result object per line.
+
+    Records are serialized one at a time instead of building the whole indented
+    document in memory first. Each checkpoint goes to a temp file that replaces
+    path only once it is complete, so a crash mid-write keeps the previous log.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(prefix=".funding_", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(tmp_fd, "w") as f:
+            f.write('{\n  "summary": ' + json.dumps(summary, indent=2).replace("\n", "\n  ") + ',\n  "results": [')
+            for i, r in enumerate(results):
+                f.write(("," if i else "") + "\n    " + json.dumps(r))
+            f.write("\n  ]\n}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _recent_balances(
+    log_dir: Path, token: str, chain_id: int, max_age_secs: int
+) -> Tuple[Optional[int], Dict[str, int]]:
+    """Last on-chain balance per address from funding_*.json logs newer than max_age_secs.
+
+    Logs are read newest first (by summary.generated_at) and the first reading found
+    for an address wins.
+    Only executed runs for the same token and chain count, and entries that were
+    themselves carried over from a log are ignored so stale values never roll forward.
+    Returns (decimals, {address: after_units}); decimals is None when nothing matched.
+    """
+    now = datetime.now(timezone.utc)
+    decimals: Optional[int] = None
+    known: Dict[str, int] = {}
+    seen: set = set()
+    fresh: List[Tuple[float, Dict[str, Any], Dict[str, Any]]] = []
+    # Order by summary.generated_at, not file name: --log can write funding_<anything>.json
+    for path in log_dir.glob("funding_*.json"):
+        try:
+            payload = json.loads(path.read_text())
+            summary = payload.get("summary") or {}
+            age = (now - datetime.fromisoformat(summary["generated_at"])).total_seconds()
+        except Exception:
+            continue
+        if age <= max_age_secs:
+            fresh.append((age, summary, payload))
+    fresh.sort(key=lambda item: item[0])
+    for _, summary, payload in fresh:
+        if summary.get("dry_run") or summary.get("chain_id") != chain_id:
+            continue
+        if not summary.get("token") or _cs(summary["token"]) != token:
+            continue
+        for r in payload.get("results") or []:
+            addr = r.get("address")
+            after = r.get("after_units")
+            if not addr or not isinstance(after, int) or r.get("balance_source") == "log":
+                continue
+            addr = _cs(addr)
+            if addr in seen:
+                continue
+            seen.add(addr)
+            known[addr] = after
+            if decimals is None and isinstance(summary.get("decimals"), int):
+                decimals = summary["decimals"]
+    return decimals, known
+
+
 def _filter_addresses(records: List[Dict[str, Any]], only: Optional[str]) -> List[str]:
-    addrs = [to_checksum_address(r.get("address")) for r in records if r.get("address")]
+    only = (only or "").strip()
     if not only:
-        return addrs
-    only = only.strip()
-    if not only:
-        return addrs
+        return [_cs(r["address"]) for r in records if r.get("address")]
     patterns = [p.strip() for p in only.split(",") if p.strip()]
-    import fnmatch
     if any("*" in p or "?" in p for p in patterns):
-        selected: List[str] = []
-        for a in addrs:
-            if any(fnmatch.fnmatch(a, p) for p in patterns):
-                selected.append(a)
-        return selected
-    wanted = {to_checksum_address(x) for x in patterns}
-    return [a for a in addrs if a in wanted]
+        rx = _compile_globs(patterns)
+        return [a for a in (_cs(r["address"]) for r in records if r.get("address")) if rx.match(a)]
+    # Literal addresses: compare lowercased strings so only matching records get checksummed
+    wanted = {_cs(x).lower() for x in patterns}
+    return [_cs(r["address"]) for r in records if r.get("address") and r["address"].lower() in wanted]
 
 
 def _filter_records_by_path(records: List[Dict[str, Any]], only_path: Optional[str]) -> List[Dict[str, Any]]:
@@ -157,24 +444,35 @@ def _filter_records_by_path(records: List[Dict[str, Any]], only_path: Optional[s
     pat = only_path.strip()
     if not pat:
         return records
-    import fnmatch
     patterns = [p.strip() for p in pat.split(",") if p.strip()]
-    selected: List[Dict[str, Any]] = []
-    for r in records:
-        path = r.get("path")
-        if not path:
-            continue
-        if any(fnmatch.fnmatch(path, p) for p in patterns):
-            selected.append(r)
-    return selected
+    if not patterns:
+        return []
+    rx = _compile_globs(patterns)
+    return [r for r in records if r.get("path") and rx.match(r["path"])]
+
 
+# Chains known to have EIP-1559 (mainnet, Gnosis); others are probed once per chain id
+_EIP1559_CHAINS = frozenset({1, 100})
+_eip1559_probed: Dict[int, bool] = {}
 
-def _is_eip1559_supported(w3: Web3) -> bool:
+
+def _is_eip1559_supported(w3: Web3, chain_id: Optional[int] = None) -> bool:
+    if chain_id in _EIP1559_CHAINS:
+        return True
+    if chain_id is not None and chain_id in _eip1559_probed:
+        return _eip1559_probed[chain_id]
     try:
         blk = w3.eth.get_block("latest")
-        return "baseFeePerGas" in blk
+        supported = "baseFeePerGas" in blk
     except Exception:
         return False
+    if chain_id is not None:
+        _eip1559_probed[chain_id] = supported
+    return supported
+
+
+def _gwei_to_wei(value: Any) -> int:
+    return _to_base_units(Decimal(str(value)), 9)
 
 
 @dataclass
@@ -184,19 +482,31 @@ class GasConfig:
     max_fee_gwei: Optional[Decimal] = None
     prio_fee_gwei: Optional[Decimal] = None
     gas_price_gwei: Optional[Decimal] = None
+    # Integer wei equivalents, filled once from the gwei fields so tx building stays in int math
+    max_fee_wei: Optional[int] = None
+    prio_fee_wei: Optional[int] = None
+    gas_price_wei: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.max_fee_wei is None and self.max_fee_gwei is not None:
+            self.max_fee_wei = _gwei_to_wei(self.max_fee_gwei)
+        if self.prio_fee_wei is None and self.prio_fee_gwei is not None:
+            self.prio_fee_wei = _gwei_to_wei(self.prio_fee_gwei)
+        if self.gas_price_wei is None and self.gas_price_gwei is not None:
+            self.gas_price_wei = _gwei_to_wei(self.gas_price_gwei)
 
     def as_tx_fields(self, w3: Web3) -> Dict[str, int]:
         if self.type == "eip1559":
-            assert self.max_fee_gwei is not None and self.prio_fee_gwei is not None
+            assert self.max_fee_wei is not None and self.prio_fee_wei is not None
             return {
-                "maxFeePerGas": _to_wei(w3, str(self.max_fee_gwei), "gwei"),
-                "maxPriorityFeePerGas": _to_wei(w3, str(self.prio_fee_gwei), "gwei"),
+                "maxFeePerGas": self.max_fee_wei,
+                "maxPriorityFeePerGas": self.prio_fee_wei,
                 "gas": int(self.gas_limit),
             }
         else:
-            assert self.gas_price_gwei is not None
+            assert self.gas_price_wei is not None
             return {
-                "gasPrice": _to_wei(w3, str(self.gas_price_gwei), "gwei"),
+                "gasPrice": self.gas_price_wei,
                 "gas": int(self.gas_limit),
             }
 
@@ -204,11 +514,11 @@ class GasConfig:
         if tx_count <= 0:
             return 0
         if self.type == "eip1559":
-            assert self.max_fee_gwei is not None
-            return _to_wei(w3, str(self.max_fee_gwei), "gwei") * int(self.gas_limit) * tx_count
+            assert self.max_fee_wei is not None
+            return self.max_fee_wei * int(self.gas_limit) * tx_count
         else:
-            assert self.gas_price_gwei is not None
-            return _to_wei(w3, str(self.gas_price_gwei), "gwei") * int(self.gas_limit) * tx_count
+            assert self.gas_price_wei is not None
+            return self.gas_price_wei * int(self.gas_limit) * tx_count
 
 
 def _load_recipients(out_dir: Path, index_path: Optional[Path]) -> List[Dict[str, Any]]:
@@ -240,12 +550,13 @@ def fund_erc20(
     dry_run: bool = False,
     log_path: Optional[Path] = None,
     require_confirm: bool = False,
+    reuse_log_secs: Optional[int] = None,
 ) -> int:
     _load_env(env_file)
 
     if not token:
         raise SystemExit("--token is required (or set SDAI_TOKEN_ADDRESS in env)")
-    token = to_checksum_address(token)
+    token = _cs(token)
 
     # Resolve funder
     pk = os.getenv(from_env) or os.getenv("PRIVATE_KEY")
@@ -254,7 +565,7 @@ def fund_erc20(
     if not pk.startswith("0x"):
         pk = "0x" + pk
     acct: LocalAccount = Account.from_key(pk)
-    funder = to_checksum_address(acct.address)
+    funder = _cs(acct.address)
 
     # Web3
     w3 = _build_w3(rpc_url)
@@ -264,14 +575,15 @@ def fund_erc20(
                 raise EnvironmentError("Web3 provider not connected (check RPC URL)")
     except Exception:
         pass
-    actual_chain_id = w3.eth.chain_id
+    # chainId, the funder's pending nonce and native balance in one round trip
+    actual_chain_id, start_nonce, funder_xdai = _funder_state(w3, funder)
     if chain_id and actual_chain_id != chain_id:
         raise SystemExit(f"Unexpected chainId {actual_chain_id}; expected {chain_id}. Use --chain-id to override.")
 
     gas = gas or GasConfig(type="eip1559", gas_limit=90000, max_fee_gwei=Decimal("2"), prio_fee_gwei=Decimal("1"))
     if gas.gas_limit < 50000:
         raise SystemExit("gas-limit too low for ERC20 transfer (recommend >= 80000)")
-    if gas.type == "eip1559" and not _is_eip1559_supported(w3):
+    if gas.type == "eip1559" and not _is_eip1559_supported(w3, actual_chain_id):
         raise SystemExit("RPC appears to not support EIP-1559 (no baseFeePerGas). Use --legacy or different RPC.")
 
     # Ensure paths if requested
@@ -305,8 +617,8 @@ def fund_erc20(
     records = _load_recipients(out_dir, index_path)
     records = _filter_records_by_path(records, only_path)
     if ensure_paths and not only and not only_path:
-        ensured_set = {to_checksum_address(r.get("address")) for r in ensured_records}
-        records = [r for r in records if to_checksum_address(r.get("address")) in ensured_set]
+        ensured_set = {_cs(r.get("address")) for r in ensured_records}
+        records = [r for r in records if _cs(r.get("address")) in ensured_set]
     if not records:
         print("No wallets found (index missing and keystore dir empty) or no matches for --only-path")
         return 1
@@ -315,19 +627,29 @@ def fund_erc20(
         print("No matching recipients after --only filtering")
         return 1
 
-    # Amounts and balances
-    contract = _erc20(w3, token)
-    decimals = _get_decimals(w3, token)
+    log_dir = out_dir if out_dir else Path("build/wallets")
     target_tokens = _parse_amount_units(amount_token)
+
+    # Wallets that a recent funding run already left at or above target need no balanceOf
+    from_log: Dict[str, int] = {}
+    if reuse_log_secs and not always_send:
+        log_decimals, known = _recent_balances(log_dir, token, actual_chain_id, int(reuse_log_secs))
+        if log_decimals is not None:
+            floor = _to_base_units(target_tokens, log_decimals)
+            from_log = {a: known[a] for a in recipients if known.get(a, -1) >= floor}
+
+    # Amounts and balances (decimals, every remaining recipient and the funder in one multicall)
+    to_query = [a for a in recipients if a not in from_log] if from_log else recipients
+    decimals, before_units, funder_token = _read_balances(w3, token, to_query, funder)
     target_units = _to_base_units(target_tokens, decimals)
+    if from_log:
+        before_units.update(from_log)
+        print(f"Reusing logged balances for {len(from_log)} wallet(s) already at target")
 
-    before_units: Dict[str, int] = {}
     deltas: Dict[str, int] = {}
     needs: List[str] = []
     for addr in recipients:
-        bal = int(contract.functions.balanceOf(addr).call())
-        before_units[addr] = bal
-        delta = target_units if always_send else max(0, target_units - bal)
+        delta = target_units if always_send else max(0, target_units - before_units[addr])
         if delta > 0:
             deltas[addr] = delta
             needs.append(addr)
@@ -335,8 +657,6 @@ def fund_erc20(
     tx_count = len(needs)
     total_units = sum(deltas.values())
     gas_budget_wei = gas.max_gas_cost_wei(w3, tx_count)
-    funder_token = int(contract.functions.balanceOf(funder).call())
-    funder_xdai = int(w3.eth.get_balance(funder))
     sufficient_token = funder_token >= total_units
     sufficient_gas = funder_xdai >= gas_budget_wei
 
@@ -368,24 +688,21 @@ def fund_erc20(
 
     results: List[Dict[str, Any]] = []
     for addr in recipients:
-        results.append(
-            {
-                "address": addr,
-                "before_units": before_units.get(addr, 0),
-                "delta_units": deltas.get(addr, 0),
-                "tx_hash": None,
-                "status": "skip" if deltas.get(addr, 0) == 0 else ("planned" if dry_run else "pending"),
-            }
-        )
+        entry = {
+            "address": addr,
+            "before_units": before_units.get(addr, 0),
+            "delta_units": deltas.get(addr, 0),
+            "tx_hash": None,
+            "status": "skip" if deltas.get(addr, 0) == 0 else ("planned" if dry_run else "pending"),
+        }
+        if addr in from_log:
+            entry["balance_source"] = "log"
+        results.append(entry)
 
-    log_dir = out_dir if out_dir else Path("build/wallets")
     log_path = log_path or _default_log_path(log_dir)
 
     if dry_run or require_confirm:
-        payload = {"summary": summary, "results": results}
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(log_path, "w") as f:
-            json.dump(payload, f, indent=2)
+        _write_log(log_path, summary, results)
         print(f"Prepared funding plan: {log_path}")
         if require_confirm and not dry_run:
             print("Pass --confirm to execute this plan.")
@@ -398,54 +715,68 @@ def fund_erc20(
             print("Insufficient token balance to cover total units. Aborting.")
         if not sufficient_gas:
             print("Insufficient native balance to cover gas. Aborting.")
-        payload = {"summary": summary, "results": results}
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(log_path, "w") as f:
-            json.dump(payload, f, indent=2)
+        _write_log(log_path, summary, results)
         return 2
 
     # Execute transfers
     gas_fields = GasConfig.as_tx_fields(gas, w3) if isinstance(gas, GasConfig) else {}
-    nonce = w3.eth.get_transaction_count(funder, "pending")
+    nonce = start_nonce
+    # Sign every transfer up front with consecutive nonces. In EIP-1559 mode only the
+    # nonce and calldata vary, so the other fields are pre-encoded once.
+    sign_tx = _tx_signer(acct)
+    sign_transfer: Optional[Callable[[int, bytes], bytes]] = None
+    if "maxFeePerGas" in gas_fields:
+        sign_transfer = _dynamic_fee_template(
+            keys.PrivateKey(bytes(acct.key)),
+            actual_chain_id,
+            gas_fields["maxPriorityFeePerGas"],
+            gas_fields["maxFeePerGas"],
+            gas_fields["gas"],
+            token,
+        )
+    signed_txs: List[Tuple[Dict[str, Any], bytes]] = []
     for r in results:
         if r["delta_units"] == 0:
             r["status"] = "skipped"
             r["after_units"] = r["before_units"]
             continue
-        to_addr = r["address"]
-        value_units = int(r["delta_units"])
-        func = _erc20(w3, token).functions.transfer(to_addr, value_units)
-        # Build raw tx with explicit gas fields
-        tx = {
-            "to": token,
-            "data": func._encode_transaction_data(),  # type: ignore[attr-defined]
-            "value": 0,
-            "nonce": nonce,
-            "chainId": actual_chain_id,
-            **gas_fields,
-        }
-        signed = Account.sign_transaction(tx, private_key=pk)
+        data = _transfer_calldata(address_word(r["address"]), int(r["delta_units"]))
+        if sign_transfer is not None:
+            signed_txs.append((r, sign_transfer(nonce, data)))
+        else:
+            # Build raw tx with explicit gas fields
+            tx = {"to": token, "data": data, "value": 0, "nonce": nonce, "chainId": actual_chain_id, **gas_fields}
+            signed_txs.append((r, sign_tx(tx)))
+        nonce += 1
+
+    # Broadcast them back to back (each send is a quick RPC, no waiting on blocks)
+    pending: List[Tuple[Dict[str, Any], Any]] = []
+    for r, raw in signed_txs:
         try:
-            raw = getattr(signed, "rawTransaction", None) or getattr(signed, "raw_transaction", None)
-            if raw is None:
-                raise AttributeError("SignedTransaction missing rawTransaction/raw_transaction")
             tx_hash = w3.eth.send_raw_transaction(raw)
             r["tx_hash"] = tx_hash.hex()
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
-            r["status"] = "success" if int(receipt.get("status", 0)) == 1 else "failed"
+            pending.append((r, tx_hash))
         except Exception as e:
             r["status"] = f"error: {e}"
-        finally:
-            nonce += 1
-            try:
-                r["after_units"] = int(_erc20(w3, token).functions.balanceOf(to_addr).call())
-            except Exception:
-                r["after_units"] = None
 
-    payload = {"summary": summary, "results": results}
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(log_path, "w") as f:
-        json.dump(payload, f, indent=2)
+    # Checkpoint the tx hashes before the (long) receipt wait so a crash doesn't lose them
+    _write_log(log_path, summary, results)
+
+    # All txs are in flight; wait for their receipts concurrently
+    receipts = _wait_receipts(w3, [h for _, h in pending], timeout)
+    for (r, _), receipt in zip(pending, receipts):
+        if isinstance(receipt, Exception):
+            r["status"] = f"error: {receipt}"
+        else:
+            r["status"] = "success" if int(receipt.get("status", 0)) == 1 else "failed"
+
+    # Post-transfer balances for every sent entry in one multicall
+    sent = [r for r in results if r["delta_units"] != 0]
+    after = _token_balances(w3, token, [r["address"] for r in sent])
+    for r in sent:
+        r["after_units"] = after.get(r["address"])
+
+    _write_log(log_path, summary, results)
 
     errors = [r for r in results if r["delta_units"] > 0 and r.get("status") not in ("success",)]
     if errors:
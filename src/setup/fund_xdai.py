@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import fnmatch
+import functools
 import json
 import os
+import re
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -19,6 +22,9 @@ from web3.types import TxParams
 from .wallet_manager import load_index, scan_keystores, save_index, upsert_record, record_for
 from .keystore import encrypt_private_key, write_keystore, derive_privkey_from_mnemonic, resolve_password
 
+# Memoized checksum conversion (one keccak per distinct address)
+_cs = functools.lru_cache(maxsize=4096)(to_checksum_address)
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -49,11 +55,25 @@ def _load_env(path: Optional[str]) -> None:
             pass
 
 
+@functools.lru_cache(maxsize=1)
+def _rpc_session():
+    """Pooled keep-alive session reused by every RPC call (connect errors retried; POSTs never re-sent)."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def _build_w3(rpc_url: Optional[str] = None) -> Web3:
     url = rpc_url or os.getenv("RPC_URL") or os.getenv("GNOSIS_RPC_URL")
     if not url:
         raise EnvironmentError("Set --rpc-url or RPC_URL/GNOSIS_RPC_URL in env")
-    w3 = Web3(Web3.HTTPProvider(url))
+    w3 = Web3(Web3.HTTPProvider(url, session=_rpc_session(), request_kwargs={"timeout": 30}))
     # Inject POA middleware (Gnosis)
     try:
         from web3.middleware import geth_poa_middleware
@@ -74,20 +94,17 @@ def _parse_amount_eth(amount_str: str) -> Decimal:
         raise ValueError(f"Invalid --amount: {amount_str}")
 
 
-def _to_wei(w3: Web3, value: Any, unit: str) -> int:
-    try:
-        # web3.py v6 style
-        to_wei = getattr(w3, "to_wei", None)
-        if callable(to_wei):
-            return int(to_wei(value, unit))
-        # fallback to class method (v5)
-        return int(Web3.toWei(value, unit))
-    except Exception:
-        return int(Web3.toWei(value, unit))
+def _to_base_units(amount: Decimal, decimals: int) -> int:
+    """Scale amount by 10**decimals and truncate, in integer math (no Decimal context rounding)."""
+    sign, digits, exponent = amount.as_tuple()
+    units = int("".join(map(str, digits)) or "0")
+    shift = int(exponent) + decimals
+    units = units * 10**shift if shift >= 0 else units // 10**-shift
+    return -units if sign else units
 
 
 def _to_wei_eth(w3: Web3, amount_eth: Decimal) -> int:
-    return _to_wei(w3, str(amount_eth), "ether")
+    return _to_base_units(amount_eth, 18)
 
 
 def _default_log_path(base_dir: Path) -> Path:
@@ -95,26 +112,25 @@ def _default_log_path(base_dir: Path) -> Path:
     return base_dir / f"funding_{ts}.json"
 
 
+def _compile_globs(patterns: List[str]) -> "re.Pattern[str]":
+    """One alternation regex for all glob patterns (fnmatchcase semantics)."""
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
 def _filter_addresses(records: List[Dict[str, Any]], only: Optional[str]) -> List[str]:
-    addrs = [to_checksum_address(r.get("address")) for r in records if r.get("address")]
+    only = (only or "").strip()
     if not only:
-        return addrs
-    only = only.strip()
-    if not only:
-        return addrs
+        return [_cs(r["address"]) for r in records if r.get("address")]
     patterns = [p.strip() for p in only.split(",") if p.strip()]
     # If any pattern contains glob wildcard, fnmatch against addresses; else treat all as literal addresses
-    import fnmatch
-
     if any("*" in p or "?" in p for p in patterns):
-        selected: List[str] = []
-        for a in addrs:
-            if any(fnmatch.fnmatch(a, p) for p in patterns):
-                selected.append(a)
-        return selected
+        rx = _compile_globs(patterns)
+        return [a for a in (_cs(r["address"]) for r in records if r.get("address")) if rx.match(a)]
     # Else, treat CSV as explicit addresses (case-insensitive)
-    wanted = {to_checksum_address(x) for x in patterns}
-    return [a for a in addrs if a in wanted]
+    # Match on lowercase hex (a plain str op) and checksum only the hits, rather
+    # than running keccak over every record of a large index
+    wanted = {_cs(x).lower() for x in patterns}
+    return [_cs(r["address"]) for r in records if r.get("address") and r["address"].lower() in wanted]
 
 
 def _filter_records_by_path(records: List[Dict[str, Any]], only_path: Optional[str]) -> List[Dict[str, Any]]:
@@ -123,25 +139,35 @@ def _filter_records_by_path(records: List[Dict[str, Any]], only_path: Optional[s
     pat = only_path.strip()
     if not pat:
         return records
-    import fnmatch
-
     patterns = [p.strip() for p in pat.split(",") if p.strip()]
-    selected: List[Dict[str, Any]] = []
-    for r in records:
-        path = r.get("path")
-        if not path:
-            continue
-        if any(fnmatch.fnmatch(path, p) for p in patterns):
-            selected.append(r)
-    return selected
+    if not patterns:
+        return []
+    rx = _compile_globs(patterns)
+    return [r for r in records if r.get("path") and rx.match(r["path"])]
 
 
-def _is_eip1559_supported(w3: Web3) -> bool:
+# EIP-1559 chains that need no baseFeePerGas probe; other chain ids are probed once
+_EIP1559_CHAINS = frozenset({1, 100})
+_eip1559_probed: Dict[int, bool] = {}
+
+
+def _is_eip1559_supported(w3: Web3, chain_id: Optional[int] = None) -> bool:
+    if chain_id in _EIP1559_CHAINS:
+        return True
+    if chain_id is not None and chain_id in _eip1559_probed:
+        return _eip1559_probed[chain_id]
     try:
         blk = w3.eth.get_block("latest")
-        return "baseFeePerGas" in blk
+        supported = "baseFeePerGas" in blk
     except Exception:
         return False
+    if chain_id is not None:
+        _eip1559_probed[chain_id] = supported
+    return supported
+
+
+def _gwei_to_wei(value: Any) -> int:
+    return _to_base_units(Decimal(str(value)), 9)
 
 
 @dataclass
@@ -151,19 +177,31 @@ class GasConfig:
     max_fee_gwei: Optional[Decimal] = None
     prio_fee_gwei: Optional[Decimal] = None
     gas_price_gwei: Optional[Decimal] = None
+    # Integer wei equivalents, filled once from the gwei fields so tx building stays in int math
+    max_fee_wei: Optional[int] = None
+    prio_fee_wei: Optional[int] = None
+    gas_price_wei: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.max_fee_wei is None and self.max_fee_gwei is not None:
+            self.max_fee_wei = _gwei_to_wei(self.max_fee_gwei)
+        if self.prio_fee_wei is None and self.prio_fee_gwei is not None:
+            self.prio_fee_wei = _gwei_to_wei(self.prio_fee_gwei)
+        if self.gas_price_wei is None and self.gas_price_gwei is not None:
+            self.gas_price_wei = _gwei_to_wei(self.gas_price_gwei)
 
     def as_tx_fields(self, w3: Web3) -> Dict[str, int]:
         if self.type == "eip1559":
-            assert self.max_fee_gwei is not None and self.prio_fee_gwei is not None
+            assert self.max_fee_wei is not None and self.prio_fee_wei is not None
             return {
-                "maxFeePerGas": _to_wei(w3, str(self.max_fee_gwei), "gwei"),
-                "maxPriorityFeePerGas": _to_wei(w3, str(self.prio_fee_gwei), "gwei"),
+                "maxFeePerGas": self.max_fee_wei,
+                "maxPriorityFeePerGas": self.prio_fee_wei,
                 "gas": int(self.gas_limit),
             }
         else:
-            assert self.gas_price_gwei is not None
+            assert self.gas_price_wei is not None
             return {
-                "gasPrice": _to_wei(w3, str(self.gas_price_gwei), "gwei"),
+                "gasPrice": self.gas_price_wei,
                 "gas": int(self.gas_limit),
             }
 
@@ -171,11 +209,11 @@ class GasConfig:
         if tx_count <= 0:
             return 0
         if self.type == "eip1559":
-            assert self.max_fee_gwei is not None
-            return _to_wei(w3, str(self.max_fee_gwei), "gwei") * int(self.gas_limit) * tx_count
+            assert self.max_fee_wei is not None
+            return self.max_fee_wei * int(self.gas_limit) * tx_count
         else:
-            assert self.gas_price_gwei is not None
-            return _to_wei(w3, str(self.gas_price_gwei), "gwei") * int(self.gas_limit) * tx_count
+            assert self.gas_price_wei is not None
+            return self.gas_price_wei * int(self.gas_limit) * tx_count
 
 
 def _load_recipients(out_dir: Path, index_path: Optional[Path]) -> List[Dict[str, Any]]:
@@ -217,7 +255,7 @@ def fund_xdai(
     if not pk.startswith("0x"):
         pk = "0x" + pk
     acct: LocalAccount = Account.from_key(pk)
-    funder = to_checksum_address(acct.address)
+    funder = _cs(acct.address)
 
     # Connect web3
     w3 = _build_w3(rpc_url)
@@ -239,7 +277,7 @@ def fund_xdai(
     # Gas sanity checks and EIP-1559 support
     if gas.gas_limit < 21000:
         raise SystemExit("gas-limit must be >= 21000 for native transfers")
-    if gas.type == "eip1559" and not _is_eip1559_supported(w3):
+    if gas.type == "eip1559" and not _is_eip1559_supported(w3, actual_chain_id):
         raise SystemExit("RPC appears to not support EIP-1559 (no baseFeePerGas). Use --legacy or different RPC.")
 
     # Optionally ensure specific HD paths exist and are indexed
@@ -277,8 +315,8 @@ def fund_xdai(
     records = _filter_records_by_path(records, only_path)
     if ensure_paths and not only and not only_path:
         # Narrow to ensured paths only when no explicit filters provided
-        ensured_set = {to_checksum_address(r.get("address")) for r in ensured_records}
-        records = [r for r in records if to_checksum_address(r.get("address")) in ensured_set]
+        ensured_set = {_cs(r.get("address")) for r in ensured_records}
+        records = [r for r in records if _cs(r.get("address")) in ensured_set]
     if not records:
         print("No wallets found (index missing and keystore dir empty) or no matches for --only-path")
         return 1
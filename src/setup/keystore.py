@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import functools
 import json
 import os
 import hashlib
 import tempfile
+import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 
 from eth_account import Account
-from eth_account.signers.local import LocalAccount
-from eth_utils import to_checksum_address
+from eth_account.hdaccount import key_from_seed, seed_from_mnemonic
+from eth_keys import keys
+from eth_utils import keccak, to_checksum_address
+
+# Keystore v3 scrypt parameters, matching eth-keyfile's defaults
+SCRYPT_N = 262144
+SCRYPT_R = 8
+SCRYPT_P = 1
+KDF_DKLEN = 32
+# pbkdf2 (hmac-sha256) iteration count used when --kdf pbkdf2 is given without --kdf-iters
+PBKDF2_ITERATIONS = 262144
+# Cap on scrypt n for hd-new batches: bounds the one-off KDF time and memory (128*r*n bytes)
+MAX_BULK_SCRYPT_N = 2 ** 18
+KDF_CHOICES = ("scrypt", "pbkdf2")
 
 
 def _normalize_privkey_hex(pk: str) -> str:
@@ -25,6 +39,19 @@ def _normalize_privkey_hex(pk: str) -> str:
     return "0x" + pk
 
 
+def getenv_first(*names: Optional[str]) -> Optional[str]:
+    """Return the first non-empty env value among names, looking each distinct name up once."""
+    seen = set()
+    for name in names:
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        val = os.environ.get(name)
+        if val:
+            return val
+    return None
+
+
 def resolve_password(cli_pass: Optional[str], pass_env: Optional[str], pk_env_name: Optional[str] = None) -> str:
     """Resolve keystore password from CLI or environment variable name.
 
@@ -33,13 +60,12 @@ def resolve_password(cli_pass: Optional[str], pass_env: Optional[str], pk_env_na
     """
     if cli_pass:
         return cli_pass
-    env_name = pass_env or "WALLET_KEYSTORE_PASSWORD"
-    pwd = os.getenv(env_name) or os.getenv("WALLET_KEYSTORE_PASSWORD")
+    pwd = getenv_first(pass_env, "WALLET_KEYSTORE_PASSWORD")
     if pwd:
         return pwd
     # Optional fallback: derive a deterministic password from PRIVATE_KEY in env
     if pk_env_name:
-        pk = os.getenv(pk_env_name) or os.getenv("PRIVATE_KEY")
+        pk = getenv_first(pk_env_name, "PRIVATE_KEY")
         if pk:
             s = pk.strip()
             if s.startswith("0x"):
@@ -52,20 +78,119 @@ def resolve_password(cli_pass: Optional[str], pass_env: Optional[str], pk_env_na
     )
 
 
-def encrypt_private_key(private_key_hex: str, password: str) -> Tuple[Dict[str, Any], str]:
-    """Encrypt a private key into a keystore JSON and return (keystore, checksum address)."""
+def _kdf_iterations(kdf: Optional[str], iterations: Optional[int]) -> Optional[int]:
+    """Validate kdf and fill in the default pbkdf2 iteration count."""
+    if kdf is not None and kdf not in KDF_CHOICES:
+        raise ValueError(f"unsupported kdf {kdf!r} (expected one of {', '.join(KDF_CHOICES)})")
+    if iterations is not None and iterations <= 0:
+        raise ValueError("kdf iterations must be positive")
+    if kdf != "pbkdf2" and iterations is not None and iterations & (iterations - 1):
+        raise ValueError(f"scrypt n must be a power of two (got --kdf-iters {iterations})")
+    if kdf == "pbkdf2" and iterations is None:
+        return PBKDF2_ITERATIONS
+    return iterations
+
+
+def encrypt_private_key(
+    private_key_hex: str, password: str, kdf: Optional[str] = None, iterations: Optional[int] = None
+) -> Tuple[Dict[str, Any], str]:
+    """Encrypt a private key into a keystore JSON and return (keystore, checksum address).
+
+    kdf is "scrypt" (default) or "pbkdf2"; iterations is scrypt's n or pbkdf2's c.
+    """
     priv = _normalize_privkey_hex(private_key_hex)
-    acct: LocalAccount = Account.from_key(priv)
-    keystore: Dict[str, Any] = Account.encrypt(priv, password)
-    address = to_checksum_address(acct.address)
+    return encrypt_private_key_bytes(bytes.fromhex(priv[2:]), password, kdf, iterations)
+
+
+def encrypt_private_key_bytes(
+    private_key: bytes, password: str, kdf: Optional[str] = None, iterations: Optional[int] = None
+) -> Tuple[Dict[str, Any], str]:
+    """Like encrypt_private_key, but takes the raw 32-byte key and skips the hex round-trip."""
+    if len(private_key) != 32:
+        raise ValueError("private key must be 32 bytes")
+    iterations = _kdf_iterations(kdf, iterations)
+    keystore: Dict[str, Any] = Account.encrypt(private_key, password, kdf=kdf, iterations=iterations)
+    # Account.encrypt already derived the address; reuse it instead of a second secp256k1 mul
+    address = to_checksum_address("0x" + keystore["address"])
     return keystore, address
 
 
-def decrypt_keystore(keystore_json: Dict[str, Any], password: str) -> str:
-    """Decrypt a keystore JSON and return the 0x-prefixed private key hex string."""
-    key_bytes = Account.decrypt(keystore_json, password)
-    # Ensure plain bytes before hex() to avoid leading '0x' from HexBytes.hex()
-    return "0x" + bytes(key_bytes).hex()
+def encrypt_private_keys(
+    private_keys_hex: Sequence[str], password: str, kdf: Optional[str] = None, iterations: Optional[int] = None
+) -> List[Tuple[Dict[str, Any], str]]:
+    """Encrypt several private keys under one password, running the KDF only once.
+
+    Produces standard v3 keystores (aes-128-ctr + scrypt/pbkdf2) that share one salt and
+    therefore one derived key; each key gets its own random IV. Returns a list of
+    (keystore, checksum address) in input order. Raises ValueError for scrypt n above
+    MAX_BULK_SCRYPT_N.
+    """
+    from Crypto.Cipher import AES
+    from Crypto.Util import Counter
+
+    kdf = kdf or "scrypt"
+    iterations = _kdf_iterations(kdf, iterations)
+    salt = os.urandom(16)
+    if kdf == "pbkdf2":
+        derived_key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, KDF_DKLEN)
+        kdfparams: Dict[str, Any] = {"c": iterations, "dklen": KDF_DKLEN, "prf": "hmac-sha256", "salt": salt.hex()}
+    else:
+        from Crypto.Protocol.KDF import scrypt
+
+        n = iterations or SCRYPT_N
+        if n > MAX_BULK_SCRYPT_N:
+            raise ValueError(f"scrypt n={n} exceeds the bulk limit of {MAX_BULK_SCRYPT_N}; use --kdf pbkdf2 or a smaller --kdf-iters")
+        derived_key = scrypt(password, salt=salt, key_len=KDF_DKLEN, N=n, r=SCRYPT_R, p=SCRYPT_P)
+        kdfparams = {"dklen": KDF_DKLEN, "n": n, "r": SCRYPT_R, "p": SCRYPT_P, "salt": salt.hex()}
+
+    # One urandom read for every IV in the batch instead of one per key
+    iv_pool = os.urandom(16 * len(private_keys_hex))
+    out: List[Tuple[Dict[str, Any], str]] = []
+    for i, pk_hex in enumerate(private_keys_hex):
+        priv = bytes.fromhex(_normalize_privkey_hex(pk_hex)[2:])
+        iv = iv_pool[16 * i:16 * (i + 1)]
+        ctr = Counter.new(128, initial_value=int.from_bytes(iv, "big"), allow_wraparound=True)
+        ciphertext = AES.new(derived_key[:16], AES.MODE_CTR, counter=ctr).encrypt(priv)
+        mac = keccak(derived_key[16:32] + ciphertext)
+        address = keys.PrivateKey(priv).public_key.to_checksum_address()
+        keystore: Dict[str, Any] = {
+            "address": address[2:].lower(),
+            "crypto": {
+                "cipher": "aes-128-ctr",
+                "cipherparams": {"iv": iv.hex()},
+                "ciphertext": ciphertext.hex(),
+                "kdf": kdf,
+                "kdfparams": dict(kdfparams),
+                "mac": mac.hex(),
+            },
+            "id": str(uuid.uuid4()),
+            "version": 3,
+        }
+        out.append((keystore, address))
+    return out
+
+
+def decrypt_keystore(keystore_json: Dict[str, Any], password: str) -> Tuple[str, str]:
+    """Decrypt a keystore JSON and return (0x-prefixed private key hex, checksum address)."""
+    key = keys.PrivateKey(bytes(Account.decrypt(keystore_json, password)))
+    return key.to_hex(), key.public_key.to_checksum_address()
+
+
+def describe_kdf(keystore_json: Dict[str, Any]) -> str:
+    """One-line summary of a keystore's KDF and a rough single-core decrypt time."""
+    crypto = keystore_json.get("crypto") or keystore_json.get("Crypto") or {}
+    kdf = crypto.get("kdf", "unknown")
+    params = crypto.get("kdfparams") or {}
+    if kdf == "scrypt":
+        n, r = int(params.get("n", 0)), int(params.get("r", SCRYPT_R))
+        # Roughly 1s for the eth-keyfile default (n=2^18, r=8); cost is linear in n*r
+        secs = n * r / (SCRYPT_N * SCRYPT_R)
+        return f"scrypt n=2^{max(n, 1).bit_length() - 1} r={r} (~{secs:.1f}s)"
+    if kdf == "pbkdf2":
+        c = int(params.get("c", 0))
+        # hashlib manages on the order of 1M hmac-sha256 rounds per second
+        return f"pbkdf2 {params.get('prf', 'hmac-sha256')} c={c} (~{c / 1_000_000:.1f}s)"
+    return str(kdf)
 
 
 def write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
@@ -102,6 +227,41 @@ def write_keystore(out_dir: Path, address: str, keystore_json: Dict[str, Any]) -
     return dest
 
 
+def write_keystores_batch(out_dir: Path, items: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Path]:
+    """Write many (address, keystore) pairs into out_dir; returns the paths in input order.
+
+    Same atomic temp-file + rename as write_keystore, but instead of an fsync per file
+    the whole batch is flushed with one os.sync() before the renames and one after.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    staged: List[Tuple[str, Path]] = []
+    try:
+        for address, keystore_json in items:
+            tmp_fd, tmp_path = tempfile.mkstemp(prefix="keystore_", suffix=".tmp", dir=str(out_dir))
+            staged.append((tmp_path, out_dir / keystore_filename(address)))
+            with os.fdopen(tmp_fd, "w", buffering=1 << 16) as f:
+                json.dump(keystore_json, f, separators=(",", ":"))
+        if not hasattr(os, "sync"):
+            # Windows: no global sync, fall back to per-file fsync
+            for tmp_path, _ in staged:
+                with open(tmp_path, "rb+") as f:
+                    os.fsync(f.fileno())
+        else:
+            os.sync()
+        for tmp_path, dest in staged:
+            os.replace(tmp_path, dest)
+        if hasattr(os, "sync"):
+            os.sync()
+    finally:
+        for tmp_path, _ in staged:
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except Exception:
+                pass
+    return [dest for _, dest in staged]
+
+
 def read_keystore(path: Path) -> Dict[str, Any]:
     return read_json(path)
 
@@ -113,10 +273,12 @@ def write_env_private_key(out_dir: Path, address: str, private_key_hex: str) ->
     env_path = out_dir / f".env.{addr}"
     tmp_fd, tmp_path = tempfile.mkstemp(prefix="envkey_", suffix=".tmp", dir=str(out_dir))
     try:
-        with os.fdopen(tmp_fd, "w") as f:
-            f.write(f"PRIVATE_KEY={private_key_hex}\n")
-            f.flush()
-            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; write it in one unbuffered call
+        try:
+            os.write(tmp_fd, f"PRIVATE_KEY={private_key_hex}\n".encode())
+            os.fsync(tmp_fd)
+        finally:
+            os.close(tmp_fd)
         os.replace(tmp_path, env_path)
     finally:
         try:
@@ -127,14 +289,31 @@ def write_env_private_key(out_dir: Path, address: str, private_key_hex: str) ->
     return env_path
 
 
+def write_secret_file(path: Path, content: str) -> Path:
+    """Write content to path in a single write, creating the file with mode 0600."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        # O_CREAT's mode only applies to new files; tighten pre-existing ones too
+        os.fchmod(fd, 0o600)
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+    return path
+
+
+@functools.lru_cache(maxsize=4)
+def _seed_for_mnemonic(mnemonic: str) -> bytes:
+    # The 2048-round PBKDF2 seed stretch dominates derivation; batch callers reuse
+    # one mnemonic across many paths, so only the first call pays for it.
+    return seed_from_mnemonic(mnemonic, "")
+
+
 def derive_privkey_from_mnemonic(mnemonic: str, path: str) -> Tuple[str, str]:
     """Derive a private key and address from a BIP-32/44 path using a BIP-39 mnemonic.
 
     Returns (private_key_hex, checksum_address).
     """
-    # Enable HD wallet features (eth-account marks as unaudited)
-    Account.enable_unaudited_hdwallet_features()
-    acct: LocalAccount = Account.from_mnemonic(mnemonic, account_path=path)
-    priv_hex = "0x" + bytes(acct.key).hex()
-    address = to_checksum_address(acct.address)
-    return priv_hex, address
+    # Same derivation as Account.from_mnemonic, but with the BIP-39 seed cached per mnemonic
+    key = keys.PrivateKey(key_from_seed(_seed_for_mnemonic(mnemonic), path))
+    return key.to_hex(), key.public_key.to_checksum_address()
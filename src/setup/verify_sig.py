@@ -1,10 +1,24 @@
 #!/usr/bin/env python3
-from eth_account._utils.signing import to_standard_v
-from eth_account._utils.structured_data.hashing import hash_domain, hash_struct_message
-from eth_utils import to_hex, keccak, to_bytes
+from eth_utils import keccak, to_checksum_address
 from eth_keys import keys
 import sys
 
+try:
+    # libsecp256k1 binding; much faster recovery than eth_keys' pure-Python backend
+    from coincurve import PublicKey as _CoincurvePublicKey
+except ImportError:
+    _CoincurvePublicKey = None
+
+
+def recover_address(digest: bytes, v: int, r: int, s: int) -> str:
+    """Recover the checksum signer address from a 32-byte digest and (v, r, s)."""
+    recovery_id = v - 27 if v >= 27 else v
+    sig = r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([recovery_id])
+    if _CoincurvePublicKey is not None:
+        pub = _CoincurvePublicKey.from_signature_and_message(sig, digest, hasher=None)
+        return to_checksum_address(keccak(pub.format(compressed=False)[1:])[-20:])
+    return keys.Signature(sig).recover_public_key_from_msg_hash(digest).to_checksum_address()
+
 def verify_signature(digest_hex, r_hex, s_hex, v_int):
     """
     Verify a signature by recovering the address from digest and signature components
@@ -22,11 +36,8 @@ def verify_signature(digest_hex, r_hex, s_hex, v_int):
         s = int(s_hex, 16)
         v = v_int
         
-        # Recover the public key
-        pub = keys.ecdsa_recover(digest, v, r, s)
-        
-        # Convert to checksum address
-        addr = pub.to_checksum_address()
+        # Recover the signer address
+        addr = recover_address(digest, v, r, s)
         
         print(f"Recovered address: {addr}")
         print(f"Expected signer address: 0x0000000000000000000000000000000000000041")
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import functools
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Iterable, Tuple
@@ -9,6 +12,11 @@ from typing import List, Dict, Any, Optional, Iterable, Tuple
 from eth_account import Account
 from eth_utils import to_checksum_address
 
+try:
+    import orjson  # optional; much faster than json for large indexes
+except ImportError:
+    orjson = None
+
 from .keystore import (
     encrypt_private_key,
     write_keystore,
@@ -21,6 +29,7 @@ def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@functools.lru_cache(maxsize=4096)
 def _norm_addr(addr: str) -> str:
     return to_checksum_address(addr)
 
@@ -30,11 +39,10 @@ def ensure_dir(p: Path) -> None:
 
 
 def load_index(index_path: Path) -> List[Dict[str, Any]]:
-    if not index_path.exists():
-        return []
+    # EAFP: a missing index is just an empty one; avoids a stat() before open()
     try:
-        with open(index_path, "r") as f:
-            data = json.load(f)
+        raw = index_path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         if isinstance(data, list):
             return data
         if isinstance(data, dict) and "wallets" in data:
@@ -47,8 +55,10 @@ def load_index(index_path: Path) -> List[Dict[str, Any]]:
 def save_index(index_path: Path, records: List[Dict[str, Any]]) -> None:
     ensure_dir(index_path.parent)
     payload = {"wallets": records}
-    with open(index_path, "w") as f:
-        json.dump(payload, f, indent=2)
+    if orjson is not None:
+        index_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        index_path.write_text(json.dumps(payload, indent=2))
 
 
 def upsert_record(records: List[Dict[str, Any]], rec: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -68,16 +78,19 @@ def upsert_record(records: List[Dict[str, Any]], rec: Dict[str, Any]) -> List[Di
 
 def scan_keystores(keystore_dir: Path) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
-    if not keystore_dir.exists():
+    try:
+        with os.scandir(keystore_dir) as it:
+            names = sorted(e.name for e in it if e.name.startswith("0x") and e.name.endswith(".json"))
+    except FileNotFoundError:
         return results
-    for p in sorted(keystore_dir.glob("0x*.json")):
+    for name in names:
         try:
-            addr = to_checksum_address(p.stem)
+            addr = to_checksum_address(name[:-5])
         except Exception:
             continue
         results.append({
             "address": addr,
-            "keystore_path": str(p),
+            "keystore_path": str(keystore_dir / name),
             "created_at": _utc_now_iso(),
             "tags": [],
         })
@@ -97,13 +110,30 @@ def record_for(address: str, ks_path: Path, *, source: str, derivation_path: Opt
     return rec
 
 
-def derive_hd_batch(mnemonic: str, path_base: str, start: int, count: int, password: str, out_dir: Path, *, tags: Optional[List[str]] = None, emit_env: bool = False, insecure_plain: bool = False) -> List[Dict[str, Any]]:
-    Account.enable_unaudited_hdwallet_features()
+# Below this many keys, process-pool startup costs more than the parallel scrypt saves
+_ENCRYPT_POOL_MIN = 4
+
+
+def _encrypt_job(job: Tuple[str, str]) -> Dict[str, Any]:
+    priv_hex, password = job
+    return encrypt_private_key(priv_hex, password)[0]
+
+
+def _encrypt_many(priv_hexes: List[str], password: str, use_pool: bool = True) -> List[Dict[str, Any]]:
+    """Encrypt each key into its own keystore (own salt + scrypt), in a process pool for larger batches."""
+    workers = min(len(priv_hexes), os.cpu_count() or 1)
+    if not use_pool or len(priv_hexes) < _ENCRYPT_POOL_MIN or workers < 2:
+        return [_encrypt_job((k, password)) for k in priv_hexes]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_encrypt_job, [(k, password) for k in priv_hexes]))
+
+
+def derive_hd_batch(mnemonic: str, path_base: str, start: int, count: int, password: str, out_dir: Path, *, tags: Optional[List[str]] = None, emit_env: bool = False, insecure_plain: bool = False, use_pool: bool = True) -> List[Dict[str, Any]]:
     records: List[Dict[str, Any]] = []
-    for i in range(start, start + count):
-        path = f"{path_base}/{i}"
-        priv_hex, address = derive_privkey_from_mnemonic(mnemonic, path)
-        ks, _ = encrypt_private_key(priv_hex, password)
+    paths = [f"{path_base}/{i}" for i in range(start, start + count)]
+    derived = [derive_privkey_from_mnemonic(mnemonic, path) for path in paths]
+    keystores = _encrypt_many([priv_hex for priv_hex, _ in derived], password, use_pool)
+    for path, (priv_hex, address), ks in zip(paths, derived, keystores):
         ks_path = write_keystore(out_dir, address, ks)
         if emit_env and insecure_plain:
             write_env_private_key(out_dir, address, priv_hex)
@@ -111,13 +141,13 @@ def derive_hd_batch(mnemonic: str, path_base: str, start: int, count: int, passw
     return records
 
 
-def create_random_wallets(count: int, password: str, out_dir: Path, *, tags: Optional[List[str]] = None, emit_env: bool = False, insecure_plain: bool = False) -> List[Dict[str, Any]]:
+def create_random_wallets(count: int, password: str, out_dir: Path, *, tags: Optional[List[str]] = None, emit_env: bool = False, insecure_plain: bool = False, use_pool: bool = True) -> List[Dict[str, Any]]:
     records: List[Dict[str, Any]] = []
-    for _ in range(count):
-        acct = Account.create()
-        priv_hex = "0x" + bytes(acct.key).hex()
+    accts = [Account.create() for _ in range(count)]
+    priv_hexes = ["0x" + bytes(acct.key).hex() for acct in accts]
+    keystores = _encrypt_many(priv_hexes, password, use_pool)
+    for acct, priv_hex, ks in zip(accts, priv_hexes, keystores):
         address = to_checksum_address(acct.address)
-        ks, _ = encrypt_private_key(priv_hex, password)
         ks_path = write_keystore(out_dir, address, ks)
         if emit_env and insecure_plain:
             write_env_private_key(out_dir, address, priv_hex)
@@ -125,15 +155,19 @@ def create_random_wallets(count: int, password: str, out_dir: Path, *, tags: Opt
     return records
 
 
-def import_private_keys(keys: Iterable[str], password: str, out_dir: Path, *, tags: Optional[List[str]] = None, emit_env: bool = False, insecure_plain: bool = False) -> List[Dict[str, Any]]:
+def import_private_keys(keys: Iterable[str], password: str, out_dir: Path, *, tags: Optional[List[str]] = None, emit_env: bool = False, insecure_plain: bool = False, use_pool: bool = True) -> List[Dict[str, Any]]:
     records: List[Dict[str, Any]] = []
+    priv_hexes: List[str] = []
     for k in keys:
         k = k.strip()
         if not k:
             continue
         if not k.startswith("0x"):
             k = "0x" + k
-        ks, address = encrypt_private_key(k, password)
+        priv_hexes.append(k)
+    keystores = _encrypt_many(priv_hexes, password, use_pool)
+    for k, ks in zip(priv_hexes, keystores):
+        address = to_checksum_address("0x" + ks["address"])
         ks_path = write_keystore(out_dir, address, ks)
         if emit_env and insecure_plain:
             write_env_private_key(out_dir, address, k)
@@ -0,0 +1,32 @@
+"""
+Mock JSON-RPC provider shared by the EIP-7702 tests
+===================================================
+
+Answers the handful of calls the transaction builder makes (chain ID, nonce,
+gas price, latest block) without a node.
+"""
+
+from web3.providers import BaseProvider
+
+
+class MockProvider(BaseProvider):
+    RESULTS = {
+        "eth_chainId": "0x64",  # 100 in hex (Gnosis Chain)
+        "eth_getTransactionCount": "0x0",  # nonce 0
+        "eth_gasPrice": "0x4a817c800",  # 20 gwei
+        "eth_getBlockByNumber": {"baseFeePerGas": "0x3b9aca00"},  # 1 gwei
+    }
+
+    def make_request(self, method, params):
+        if method not in self.RESULTS:
+            raise NotImplementedError(f"Mock provider doesn't support {method}")
+        return {"jsonrpc": "2.0", "id": 1, "result": self.RESULTS[method]}
+
+    def make_batch_request(self, requests):
+        """Answer a JSON-RPC batch: (method, params) pairs or {"method", "params"} dicts, replies in order."""
+        responses = []
+        for i, req in enumerate(requests):
+            method, params = (req["method"], req.get("params", [])) if isinstance(req, dict) else req
+            response = self.make_request(method, params)
+            responses.append({**response, "id": i})
+        return responses
@@ -11,13 +11,20 @@ import sys
 from decimal import Decimal
 from web3 import Web3
 from eth_account import Account
-from eth_utils import to_hex
+from eth_utils import keccak, to_hex
 import json
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.helpers.eip7702_builder import EIP7702TransactionBuilder, create_test_transaction
+from src.helpers.eip7702_builder import MAX_UINT256, EIP7702TransactionBuilder, create_test_transaction
+from tests._mock_provider import MockProvider
+
+APPROVE_SELECTOR = keccak(text="approve(address,uint256)")[:4]
+SPLIT_SELECTOR = keccak(text="splitPosition(address,address,uint256)")[:4]
+
+# Derived once for the module; every test signs with the same key
+TEST_ACCOUNT = Account.from_key("0x" + "1" * 64)  # Test private key (DO NOT USE IN PRODUCTION)
 
 
 def test_authorization_signing():
@@ -25,8 +32,7 @@ def test_authorization_signing():
     print("\n=== Testing Authorization Signing ===")
     
     # Create a test account
-    private_key = "0x" + "1" * 64  # Test private key (DO NOT USE IN PRODUCTION)
-    account = Account.from_key(private_key)
+    account = TEST_ACCOUNT
     print(f"Test account address: {account.address}")
     
     # Create authorization
@@ -66,24 +72,9 @@ def test_transaction_builder():
     print("\n=== Testing Transaction Builder ===")
     
     # Setup - use a mock provider for chain_id
-    from web3.providers import BaseProvider
-    
-    class MockProvider(BaseProvider):
-        def make_request(self, method, params):
-            if method == "eth_chainId":
-                return {"jsonrpc": "2.0", "id": 1, "result": "0x64"}  # 100 in hex
-            elif method == "eth_getTransactionCount":
-                return {"jsonrpc": "2.0", "id": 1, "result": "0x0"}  # nonce 0
-            elif method == "eth_gasPrice":
-                return {"jsonrpc": "2.0", "id": 1, "result": "0x4a817c800"}  # 20 gwei
-            elif method == "eth_getBlockByNumber":
-                return {"jsonrpc": "2.0", "id": 1, "result": {"baseFeePerGas": "0x3b9aca00"}}  # 1 gwei
-            raise NotImplementedError(f"Mock provider doesn't support {method}")
-    
     w3 = Web3(MockProvider())
     implementation_address = "0x1234567890123456789012345678901234567890"
-    private_key = "0x" + "1" * 64
-    account = Account.from_key(private_key)
+    account = TEST_ACCOUNT
     
     # Create builder
     builder = EIP7702TransactionBuilder(w3, implementation_address)
@@ -95,7 +86,7 @@ def test_transaction_builder():
     builder.add_approval(
         token="0xaf204776c7245bF4147c2612BF6e5972Ee483701",  # sDAI on Gnosis
         spender="0x1111111111111111111111111111111111111111",
-        amount=2**256 - 1
+        amount=MAX_UINT256
     )
     print("✓ Added approval call")
     
@@ -174,24 +165,9 @@ def test_simple_transaction():
     """Test creating a simple test transaction."""
     print("\n=== Testing Simple Transaction Creation ===")
     
-    from web3.providers import BaseProvider
-    
-    class MockProvider(BaseProvider):
-        def make_request(self, method, params):
-            if method == "eth_chainId":
-                return {"jsonrpc": "2.0", "id": 1, "result": "0x64"}  # 100 in hex
-            elif method == "eth_getTransactionCount":
-                return {"jsonrpc": "2.0", "id": 1, "result": "0x0"}  # nonce 0
-            elif method == "eth_gasPrice":
-                return {"jsonrpc": "2.0", "id": 1, "result": "0x4a817c800"}  # 20 gwei
-            elif method == "eth_getBlockByNumber":
-                return {"jsonrpc": "2.0", "id": 1, "result": {"baseFeePerGas": "0x3b9aca00"}}  # 1 gwei
-            raise NotImplementedError(f"Mock provider doesn't support {method}")
-    
     w3 = Web3(MockProvider())
     implementation_address = "0x1234567890123456789012345678901234567890"
-    private_key = "0x" + "1" * 64
-    account = Account.from_key(private_key)
+    account = TEST_ACCOUNT
     
     try:
         tx = create_test_transaction(w3, implementation_address, account)
@@ -208,13 +184,12 @@ def test_call_encoding():
     """Test encoding of individual calls."""
     print("\n=== Testing Call Encoding ===")
     
-    from eth_utils import keccak
     from eth_abi import encode
     
     # Test approve encoding
-    function_selector = keccak(text="approve(address,uint256)")[:4]
+    function_selector = APPROVE_SELECTOR
     spender = "0x1111111111111111111111111111111111111111"
-    amount = 2**256 - 1
+    amount = MAX_UINT256
     
     encoded_params = encode(['address', 'uint256'], [spender, amount])
     data = function_selector + encoded_params
@@ -224,7 +199,7 @@ def test_call_encoding():
     print(f"  Total data length: {len(data)} bytes")
     
     # Test splitPosition encoding
-    function_selector = keccak(text="splitPosition(address,address,uint256)")[:4]
+    function_selector = SPLIT_SELECTOR
     proposal = "0x2222222222222222222222222222222222222222"
     collateral = "0x3333333333333333333333333333333333333333"
     amount = 1000000000000000000  # 1 ether in wei
@@ -17,47 +17,40 @@ from eth_utils import to_hex
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.helpers.eip7702_builder import EIP7702TransactionBuilder
+from src.helpers.eip7702_builder import MAX_UINT256, EIP7702TransactionBuilder
+from tests._mock_provider import MockProvider
+
+# Key derivation happens once at import
+ACCOUNT = Account.from_key(os.getenv("PRIVATE_KEY", "0x" + "1" * 64))  # Use test key if not set
+
+# Contract addresses: env var name and default for each
+_ADDR_ENV = {
+    'futarchy_router': ("FUTARCHY_ROUTER_ADDRESS", "0x2222222222222222222222222222222222222222"),
+    'proposal': ("FUTARCHY_PROPOSAL_ADDRESS", "0x3333333333333333333333333333333333333333"),
+    'sdai_token': ("SDAI_TOKEN_ADDRESS", "0xaf204776c7245bF4147c2612BF6e5972Ee483701"),
+    'company_token': ("COMPANY_TOKEN_ADDRESS", "0x9c58bacc331c9aa871afd802db6379a98e80cedb"),
+    'swapr_router': ("SWAPR_ROUTER_ADDRESS", "0x4444444444444444444444444444444444444444"),
+    'balancer_vault': ("BALANCER_VAULT_ADDRESS", "0x5555555555555555555555555555555555555555"),
+    'sdai_yes': ("SWAPR_SDAI_YES_ADDRESS", "0x6666666666666666666666666666666666666666"),
+    'sdai_no': ("SWAPR_SDAI_NO_ADDRESS", "0x7777777777777777777777777777777777777777"),
+    'company_yes': ("SWAPR_GNO_YES_ADDRESS", "0x8888888888888888888888888888888888888888"),
+    'company_no': ("SWAPR_GNO_NO_ADDRESS", "0x9999999999999999999999999999999999999999"),
+}
+# Checksummed once at import instead of on every test run
+ADDRS = {k: Web3.to_checksum_address(os.getenv(env, default)) for k, (env, default) in _ADDR_ENV.items()}
 
 
 def test_buy_conditional_bundle():
     """Test building a complete buy conditional arbitrage bundle."""
     print("\n=== Testing Buy Conditional Arbitrage Bundle ===")
     
-    # Mock provider for testing
-    from web3.providers import BaseProvider
-    
-    class MockProvider(BaseProvider):
-        def make_request(self, method, params):
-            responses = {
-                "eth_chainId": {"jsonrpc": "2.0", "id": 1, "result": "0x64"},  # Gnosis Chain
-                "eth_getTransactionCount": {"jsonrpc": "2.0", "id": 1, "result": "0x0"},
-                "eth_gasPrice": {"jsonrpc": "2.0", "id": 1, "result": "0x4a817c800"},
-                "eth_getBlockByNumber": {"jsonrpc": "2.0", "id": 1, "result": {"baseFeePerGas": "0x3b9aca00"}},
-            }
-            if method in responses:
-                return responses[method]
-            raise NotImplementedError(f"Mock provider doesn't support {method}")
-    
     # Setup
     w3 = Web3(MockProvider())
     implementation_address = "0x1234567890123456789012345678901234567890"  # FutarchyBatchExecutor
-    private_key = os.getenv("PRIVATE_KEY", "0x" + "1" * 64)  # Use test key if not set
-    account = Account.from_key(private_key)
+    account = ACCOUNT
     
     # Contract addresses (from environment or defaults)
-    addresses = {
-        'futarchy_router': os.getenv("FUTARCHY_ROUTER_ADDRESS", "0x2222222222222222222222222222222222222222"),
-        'proposal': os.getenv("FUTARCHY_PROPOSAL_ADDRESS", "0x3333333333333333333333333333333333333333"),
-        'sdai_token': os.getenv("SDAI_TOKEN_ADDRESS", "0xaf204776c7245bF4147c2612BF6e5972Ee483701"),
-        'company_token': os.getenv("COMPANY_TOKEN_ADDRESS", "0x9c58bacc331c9aa871afd802db6379a98e80cedb"),
-        'swapr_router': os.getenv("SWAPR_ROUTER_ADDRESS", "0x4444444444444444444444444444444444444444"),
-        'balancer_vault': os.getenv("BALANCER_VAULT_ADDRESS", "0x5555555555555555555555555555555555555555"),
-        'sdai_yes': os.getenv("SWAPR_SDAI_YES_ADDRESS", "0x6666666666666666666666666666666666666666"),
-        'sdai_no': os.getenv("SWAPR_SDAI_NO_ADDRESS", "0x7777777777777777777777777777777777777777"),
-        'company_yes': os.getenv("SWAPR_GNO_YES_ADDRESS", "0x8888888888888888888888888888888888888888"),
-        'company_no': os.getenv("SWAPR_GNO_NO_ADDRESS", "0x9999999999999999999999999999999999999999"),
-    }
+    addresses = ADDRS
     
     # Amount to arbitrage (1 sDAI)
     amount = w3.to_wei(1, 'ether')
@@ -91,7 +84,7 @@ def test_buy_conditional_bundle():
     builder.add_approval(
         addresses['sdai_yes'],
         addresses['swapr_router'],
-        2**256 - 1  # Max approval
+        MAX_UINT256  # Max approval
     )
     print("✓ Added approval for YES conditional sDAI")
     
@@ -112,7 +105,7 @@ def test_buy_conditional_bundle():
     builder.add_approval(
         addresses['sdai_no'],
         addresses['swapr_router'],
-        2**256 - 1
+        MAX_UINT256
     )
     print("✓ Added approval for NO conditional sDAI")
     
@@ -129,16 +122,10 @@ def test_buy_conditional_bundle():
     print("✓ Added swap NO sDAI → NO Company")
     
     # Step 7: Approve FutarchyRouter for Company tokens
-    builder.add_approval(
-        addresses['company_yes'],
-        addresses['futarchy_router'],
-        2**256 - 1
-    )
-    builder.add_approval(
-        addresses['company_no'],
-        addresses['futarchy_router'],
-        2**256 - 1
-    )
+    builder.add_approvals_batch([
+        (addresses['company_yes'], addresses['futarchy_router'], MAX_UINT256),
+        (addresses['company_no'], addresses['futarchy_router'], MAX_UINT256),
+    ])
     print("✓ Added approvals for Company tokens")
     
     # Step 8: Merge would go here but requires knowing swap outputs
@@ -0,0 +1,105 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from eth_account import Account
+from eth_keys import keys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.setup import fund_erc20
+
+TOKEN = fund_erc20._cs("0x" + "aa" * 20)
+WALLET = fund_erc20._cs("0x" + "11" * 20)
+ACCOUNT = Account.from_key("0x" + "42" * 32)
+
+
+def random_uint(rng, bits):
+    """Zero, a small value or a full-width one, so RLP's empty/short/long integer forms all show up."""
+    return rng.choice((0, rng.randrange(1, 128), rng.getrandbits(bits)))
+
+
+def random_tx(rng):
+    return {
+        "chainId": rng.choice((1, 100, rng.randrange(1, 2 ** 32))),
+        "nonce": random_uint(rng, 64),
+        "gas": rng.randrange(21000, 30_000_000),
+        "to": fund_erc20._cs("0x" + rng.randbytes(20).hex()),
+        "value": random_uint(rng, 96),
+        "data": rng.randbytes(rng.choice((0, 4, 68, rng.randrange(0, 300)))),
+    }
+
+
+def reference_raw(tx):
+    signed = Account.sign_transaction(tx, ACCOUNT.key)
+    return bytes(getattr(signed, "rawTransaction", None) or signed.raw_transaction)
+
+
+def write_log(log_dir, name, age_secs, after_units):
+    """Write a minimal executed funding log generated age_secs ago."""
+    generated_at = datetime.now(timezone.utc) - timedelta(seconds=age_secs)
+    payload = {
+        "summary": {"generated_at": generated_at.isoformat(), "chain_id": 100, "token": TOKEN, "decimals": 18},
+        "results": [{"address": WALLET, "after_units": after_units}],
+    }
+    (log_dir / name).write_text(json.dumps(payload))
+
+
+class RecentBalancesTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_stale_custom_named_log_does_not_hide_fresh_ones(self):
+        # "funding_manual.json" sorts after every timestamped name in reverse order
+        write_log(self.log_dir, "funding_20250101T000000Z.json", 10, 10**18)
+        write_log(self.log_dir, "funding_manual.json", 10**6, 5)
+        self.assertEqual(
+            fund_erc20._recent_balances(self.log_dir, TOKEN, 100, 600),
+            (18, {WALLET: 10**18}),
+        )
+
+    def test_newest_log_wins_regardless_of_name(self):
+        write_log(self.log_dir, "funding_20250101T000000Z.json", 300, 1)
+        write_log(self.log_dir, "funding_0.json", 5, 2)
+        self.assertEqual(fund_erc20._recent_balances(self.log_dir, TOKEN, 100, 600), (18, {WALLET: 2}))
+
+
+class TxSigningTests(unittest.TestCase):
+    """The hand-rolled RLP signing paths must match eth-account byte for byte."""
+
+    def test_dynamic_fee_template_matches_eth_account(self):
+        rng = random.Random(1559)
+        key = keys.PrivateKey(bytes(ACCOUNT.key))
+        for _ in range(200):
+            tx = random_tx(rng)
+            tx["maxPriorityFeePerGas"] = random_uint(rng, 40)
+            tx["maxFeePerGas"] = tx["maxPriorityFeePerGas"] + random_uint(rng, 48)
+            sign = fund_erc20._dynamic_fee_template(
+                key, tx["chainId"], tx["maxPriorityFeePerGas"], tx["maxFeePerGas"], tx["gas"], tx["to"], tx["value"]
+            )
+            self.assertEqual(sign(tx["nonce"], tx["data"]), reference_raw({**tx, "type": 2}), tx)
+
+    def test_tx_signer_matches_eth_account(self):
+        rng = random.Random(155)
+        sign = fund_erc20._tx_signer(ACCOUNT)
+        for i in range(200):
+            tx = random_tx(rng)
+            if i % 2:
+                tx["gasPrice"] = random_uint(rng, 48)
+            else:
+                tx["maxPriorityFeePerGas"] = random_uint(rng, 40)
+                tx["maxFeePerGas"] = tx["maxPriorityFeePerGas"] + random_uint(rng, 48)
+            self.assertEqual(sign(dict(tx)), reference_raw(tx), tx)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+from eth_account import Account
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.setup import keystore
+
+PASSWORD = "correct horse battery staple"
+# A handful of fixed keys: easy to eyeball and enough to exercise per-key IVs
+PRIVATE_KEYS = ["0x" + f"{i:02x}" * 32 for i in (1, 2, 3, 0x7f)]
+
+
+class EncryptPrivateKeysTests(unittest.TestCase):
+    def assert_round_trip(self, encrypted, kdf):
+        self.assertEqual(len(encrypted), len(PRIVATE_KEYS))
+        for pk_hex, (keystore_json, address) in zip(PRIVATE_KEYS, encrypted):
+            self.assertEqual(keystore_json["crypto"]["kdf"], kdf)
+            self.assertEqual(address, Account.from_key(pk_hex).address)
+            self.assertEqual(keystore_json["address"], address[2:].lower())
+            self.assertEqual(bytes(Account.decrypt(keystore_json, PASSWORD)).hex(), pk_hex[2:])
+        ivs = {ks["crypto"]["cipherparams"]["iv"] for ks, _ in encrypted}
+        self.assertEqual(len(ivs), len(PRIVATE_KEYS))
+
+    def test_scrypt_round_trip(self):
+        encrypted = keystore.encrypt_private_keys(PRIVATE_KEYS, PASSWORD, kdf="scrypt", iterations=2 ** 4)
+        self.assert_round_trip(encrypted, "scrypt")
+        self.assertEqual(encrypted[0][0]["crypto"]["kdfparams"]["n"], 2 ** 4)
+
+    def test_pbkdf2_round_trip(self):
+        encrypted = keystore.encrypt_private_keys(PRIVATE_KEYS, PASSWORD, kdf="pbkdf2", iterations=1000)
+        self.assert_round_trip(encrypted, "pbkdf2")
+        self.assertEqual(encrypted[0][0]["crypto"]["kdfparams"]["c"], 1000)
+
+    def test_scrypt_n_above_bulk_limit_is_rejected(self):
+        with self.assertRaises(ValueError):
+            keystore.encrypt_private_keys(PRIVATE_KEYS, PASSWORD, kdf="scrypt", iterations=keystore.MAX_BULK_SCRYPT_N * 2)
+
+    def test_scrypt_n_must_be_power_of_two(self):
+        with self.assertRaisesRegex(ValueError, "power of two"):
+            keystore.encrypt_private_keys(PRIVATE_KEYS, PASSWORD, kdf="scrypt", iterations=1000)
+        with self.assertRaisesRegex(ValueError, "power of two"):
+            keystore.encrypt_private_key(PRIVATE_KEYS[0], PASSWORD, iterations=1000)
+
+
+if __name__ == "__main__":
+    unittest.main()